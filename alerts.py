@@ -0,0 +1,104 @@
+# Price and percent-change alerts. Thresholds are kept sorted per (symbol, metric, direction), so a new
+# value only looks at the rules it crossed since the previous one: O(log n + k) per update, not a scan
+import bisect
+import json
+import os
+from collections import namedtuple
+
+from config import ALERTS_PATH
+
+
+# metric: "price" or "change" (percent change from the previous close); direction: "above" or "below"
+Alert = namedtuple("Alert", "symbol metric direction threshold")
+
+METRICS = ("price", "change")
+DIRECTIONS = ("above", "below")
+
+
+class AlertEngine:
+    def __init__(self, alerts=()):
+        # (symbol, metric, direction) -> (sorted thresholds, alerts in the same order)
+        self._index = {}
+        # (symbol, metric) -> last value seen
+        self._last = {}
+        for alert in alerts:
+            self.add(alert)
+
+    @classmethod
+    def load(cls, path=ALERTS_PATH):
+        if not path or not os.path.exists(path):
+            return cls()
+        # A damaged or hand-edited file must not keep the app from opening
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(
+                    Alert(a["symbol"], a["metric"], a["direction"], float(a["threshold"])) for a in json.load(f)
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    def save(self, path=ALERTS_PATH):
+        if not path:
+            return
+        # Written aside and swapped in, so a crash mid-write leaves the previous file intact
+        partial = path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump([alert._asdict() for alert in self], f, indent=2)
+        os.replace(partial, path)
+
+    def __iter__(self):
+        for _, alerts in self._index.values():
+            yield from alerts
+
+    def __len__(self):
+        return sum(len(alerts) for _, alerts in self._index.values())
+
+    def symbols(self):
+        return list(dict.fromkeys(symbol for symbol, _, _ in self._index))
+
+    def add(self, alert):
+        if alert.metric not in METRICS or alert.direction not in DIRECTIONS:
+            raise ValueError(f"Unknown alert: {alert.metric} {alert.direction}")
+        thresholds, alerts = self._index.setdefault((alert.symbol, alert.metric, alert.direction), ([], []))
+        i = bisect.bisect_right(thresholds, alert.threshold)
+        thresholds.insert(i, alert.threshold)
+        alerts.insert(i, alert)
+
+    def remove(self, alert):
+        key = (alert.symbol, alert.metric, alert.direction)
+        thresholds, alerts = self._index.get(key, ([], []))
+        i = bisect.bisect_left(thresholds, alert.threshold)
+        while i < len(alerts) and thresholds[i] == alert.threshold:
+            if alerts[i] == alert:
+                del thresholds[i], alerts[i]
+                break
+            i += 1
+        if not alerts:
+            self._index.pop(key, None)
+
+    # Alerts fired by a new price (and percent change) for `symbol`. A rule fires when the value
+    # crosses its threshold, so it doesn't repeat on every bar while the value stays past it.
+    def update(self, symbol, price, change=None):
+        fired = []
+        for metric, value in (("price", price), ("change", change)):
+            if value is None:
+                continue
+            previous = self._last.get((symbol, metric))
+            self._last[(symbol, metric)] = value
+            # Crossed upwards: previous < threshold <= value
+            thresholds, alerts = self._index.get((symbol, metric, "above"), ((), ()))
+            if thresholds:
+                low = 0 if previous is None else bisect.bisect_right(thresholds, previous)
+                fired.extend(alerts[low:bisect.bisect_right(thresholds, value)])
+            # Crossed downwards: value <= threshold < previous
+            thresholds, alerts = self._index.get((symbol, metric, "below"), ((), ()))
+            if thresholds:
+                high = len(thresholds) if previous is None else bisect.bisect_left(thresholds, previous)
+                fired.extend(alerts[bisect.bisect_left(thresholds, value):high])
+        return fired
+
+
+def describe(alert):
+    unit = "%" if alert.metric == "change" else ""
+    label = "Price" if alert.metric == "price" else "Change"
+    return f"{alert.symbol} {label} {alert.direction} {alert.threshold:g}{unit}"
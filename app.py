@@ -1,7 +1,26 @@
 # Flet Stock App With Live Data & Charts - Alpha Vantage API
+import asyncio
+import time
+
 import flet as ft
-import requests
-from config import API_KEY
+import numpy as np
+from alerts import Alert, AlertEngine, describe
+from archive import FORMATS, export_history, import_history
+from backend import get_backend
+from config import METRICS_EXPORT, SHOW_STATS, SERVER_MODE, SERVER_PORT, SUGGEST_DEBOUNCE
+from scheduler import WatchlistScheduler
+from series import OHLCVSeries, align_closes, percent_returns
+from snapshot import load_snapshot, save_snapshot
+from downsample import downsample, point_budget
+from dashboard import Dashboard, format_age
+from indicators import IndicatorCache, OSCILLATORS, OVERLAYS
+from metrics import STAGES, metrics
+from portfolio import Portfolio
+
+
+WATCHLIST_ROW_HEIGHT = 56
+WATCHLIST_HEIGHT = 400
+MAX_LOADED_SERIES = 32
 
 
 # Main Flet Interface -> Function based
@@ -22,6 +41,114 @@ def main(page: ft.Page):
     price_text_below = ft.Ref[ft.Container]()
     error_messages = ft.Ref[ft.Container]()
     time_range_dropdown = ft.Ref[ft.Dropdown]()
+    suggestion_list = ft.Ref[ft.Column]()
+
+    # Bumped on every keystroke, so only the last one in a burst looks up suggestions
+    typing = {"generation": 0}
+
+    # Indicator results per symbol, extended incrementally as new bars come in
+    indicator_cache = IndicatorCache()
+
+    # What the dashboard is currently showing, so toggling an indicator can redraw without refetching
+    view = {"symbol": None, "series": None, "time_range": None, "compare": []}
+
+    def on_indicator_change(e):
+        if view["series"] is not None:
+            render_view()
+            page.update()
+
+    # Price info and chart cards, created once and updated in place
+    async def on_compare_submit(e):
+        await on_compare(e)
+
+    dashboard = Dashboard(OVERLAYS, OSCILLATORS, on_indicator_change, on_compare_submit)
+
+    # Time series cache, market data provider (Alpha Vantage or replay) and history loader, shared by
+    # every session in the process so concurrent users never download the same symbol twice
+    backend = get_backend()
+    cache, loader = backend.cache, backend.loader
+
+    # Parsed full histories for recently viewed symbols
+    loaded_series = {}
+
+    # The lookup currently in progress (if any), and the background refreshes of stale data on screen
+    current_fetch = {"task": None, "symbol": None}
+    refresh = {"task": None, "compare": set()}
+
+    # Watchlist state
+    watchlist_input = ft.Ref[ft.TextField]()
+    watchlist_rows = ft.Ref[ft.ListView]()
+    watchlist = {"scheduler": None, "order": [], "rows": {}}
+
+    # Portfolio holdings and price alerts, and the symbols they need prices for
+    portfolio = Portfolio.load()
+    alert_engine = AlertEngine.load()
+    holding_inputs = [ft.Ref[ft.TextField]() for _ in range(3)]
+    alert_inputs = [ft.Ref[ft.TextField](), ft.Ref[ft.Dropdown](), ft.Ref[ft.TextField]()]
+    holdings_list = ft.Ref[ft.Column]()
+    alerts_list = ft.Ref[ft.Column]()
+    portfolio_totals = ft.Ref[ft.Text]()
+    tracked = {"scheduler": None, "symbols": set(), "rows": {}}
+
+    # Live mode state
+    live_switch = ft.Ref[ft.Switch]()
+    live = {"symbol": None}
+
+    # New bars stored for a symbol this session holds, whoever downloaded them
+    def on_bars(symbol):
+        loaded_series.pop(symbol, None)
+        # A lookup in progress redraws everything once it's done anyway
+        task = current_fetch["task"]
+        fetching = task is not None and not task.done()
+        on_screen = symbol == view["symbol"] or symbol in view["compare"]
+        if on_screen and view["series"] is not None and not fetching:
+            view["series"] = get_series(view["symbol"])
+            render_view()
+            page.update()
+        if symbol in watchlist["rows"]:
+            on_watchlist_result(symbol, cache.get(symbol, days=2), None)
+        if symbol in tracked["symbols"]:
+            on_tracked_result(symbol, cache.get(symbol, days=2), None)
+        release(symbol)
+
+    # Stop listening for a symbol once neither the parsed series nor the watchlist needs it
+    def release(symbol):
+        if symbol not in loaded_series and symbol not in watchlist["rows"] and symbol not in tracked["symbols"]:
+            backend.hub.unsubscribe(("bars", symbol), on_bars)
+
+    # The backend outlives the session, so only drop what this session registered. This runs once the
+    # session has expired (on_close), not on disconnect: a web client may reconnect to the same session.
+    async def close_session(e):
+        for scheduler in (watchlist["scheduler"], tracked["scheduler"]):
+            if scheduler is not None:
+                scheduler.stop()
+        start_live(None)
+        backend.hub.unsubscribe_all(on_bars)
+
+    page.on_close = close_session
+
+    # Optional on-screen timing stats (SHOW_STATS=1)
+    stats_text = ft.Ref[ft.Text]()
+    if SHOW_STATS:
+        page.overlay.append(
+            ft.Container(
+                content=ft.Text(ref=stats_text, value=metrics.format(STAGES), size=11,
+                                font_family="monospace", color=ft.Colors.WHITE),
+                bgcolor=ft.Colors.with_opacity(0.85, ft.Colors.GREY_900),
+                padding=12,
+                border_radius=8,
+                right=20,
+                bottom=20,
+            )
+        )
+
+    # Refresh the stats overlay and the metrics export after a lookup
+    def publish_metrics():
+        if METRICS_EXPORT:
+            metrics.export(METRICS_EXPORT)
+        if stats_text.current is not None:
+            stats_text.current.value = metrics.format(STAGES)
+            stats_text.current.update()
 
     # Time range for the stock
     def get_days_for_range(range_name):
@@ -38,44 +165,230 @@ def main(page: ft.Page):
     def get_range_label(range_name):
         return range_name
 
+    # Plot area width, minus the page, card and chart paddings
+    def get_chart_width():
+        return (page.width or page.window.width or 1400) - 2 * 30 - 2 * 25 - 10
+
+    # Indicator output lines for the bars on screen, in dashboard.show_chart's overlay format
+    def indicator_lines(symbol, series, indicator, label, start, points):
+        lines = []
+        for output, values in indicator_cache.get(symbol, indicator, series).items():
+            # Lines share the closes' decimated x positions; the warm-up period has no values
+            ys = values[start:][points]
+            shown = ~np.isnan(ys)
+            lines.append((label, output, points[shown].tolist(), ys[shown].tolist()))
+        return lines
+
+    # Draw the quote, chart and selected indicators for the current view
+    def render_view():
+        symbol, series, time_range = view["symbol"], view["series"], view["time_range"]
+        days = get_days_for_range(time_range)
+
+        closes = series.tail(days).close
+        start = len(series) - len(closes)
+        latest = series.latest
+
+        # Calculate price change
+        current_price = latest.close
+        previous_price = float(closes[-2]) if len(closes) > 1 else current_price
+        price_change = current_price - previous_price
+        price_change_percent = (price_change / previous_price) * 100 if previous_price != 0 else 0
+
+        # Update the dashboard in place
+        dashboard.show_quote(symbol, latest, price_change, price_change_percent)
+
+        compared = [(other, get_series(other)) for other in view["compare"] if other != symbol]
+        compared = [(other, other_series) for other, other_series in compared if len(other_series)]
+        if compared:
+            render_comparison(symbol, series, start, time_range, compared)
+            return
+
+        # Prep the charts, decimating long ranges down to what the chart can actually show
+        points = downsample(closes, point_budget(get_chart_width()))
+        selected = dashboard.selected_indicators()
+        overlays = [
+            line
+            for label, indicator in OVERLAYS.items() if label in selected
+            for line in indicator_lines(symbol, series, indicator, label, start, points)
+        ]
+        dashboard.show_chart(
+            f"Closing Price - {get_range_label(time_range)}",
+            points.tolist(),
+            closes[points].tolist(),
+            len(closes),
+            float(closes.min()),
+            float(closes.max()),
+            overlays,
+        )
+        for label, indicator in OSCILLATORS.items():
+            lines = indicator_lines(symbol, series, indicator, label, start, points) if label in selected else None
+            dashboard.show_oscillator(label, lines, len(closes))
+
+    # Percent return of each symbol since the start of the range, on every day any of them traded.
+    # Price overlays and oscillators don't share that scale, so they are hidden meanwhile.
+    def render_comparison(symbol, series, start, time_range, compared):
+        names = [symbol] + [other for other, _ in compared]
+        dates, closes = align_closes([series] + [other_series for _, other_series in compared], series.dates[start])
+        returns = percent_returns(closes)
+        # Every line is decimated at the x positions picked for the symbol on screen
+        points = downsample(returns[0], point_budget(get_chart_width()))
+        lines = []
+        for name, row in zip(names, returns):
+            ys = row[points]
+            shown = ~np.isnan(ys)
+            lines.append((name, points[shown].tolist(), ys[shown].tolist(), f"{row[-1]:+.2f}%"))
+        dashboard.show_comparison(f"Return - {get_range_label(time_range)}", lines, len(dates))
+        for label in OSCILLATORS:
+            dashboard.show_oscillator(label, None, len(dates))
+
+    # Load the compared symbols for `days` bars. Cached ones are drawn from the cache straight away and,
+    # if stale, refreshed in the background like the main symbol; only the others are waited for, and
+    # those that failed (so have nothing to draw) are flagged under the input
+    async def load_compare(symbols, days):
+        missing = [symbol for symbol in symbols if cache.last_date(symbol) is None]
+        for symbol in symbols:
+            if symbol not in missing and loader.plan(symbol, days) is not None:
+                task = asyncio.ensure_future(refresh_compared(symbol, days))
+                refresh["compare"].add(task)
+                task.add_done_callback(refresh["compare"].discard)
+        results = await asyncio.gather(*(loader.load(symbol, days) for symbol in missing), return_exceptions=True)
+        failed = []
+        for symbol, result in zip(missing, results):
+            if isinstance(result, Exception):
+                failed.append(symbol)
+            elif result:
+                loaded_series.pop(symbol, None)
+        view["compare"] = [symbol for symbol in symbols if symbol not in failed]
+        dashboard.compare_input.error_text = f"Unavailable: {', '.join(failed)}" if failed else None
+
+    # on_bars redraws the chart once new bars land; if the refresh fails the cached bars simply stay
+    async def refresh_compared(symbol, days):
+        try:
+            await loader.load(symbol, days)
+        except Exception:
+            pass
+
+    async def on_compare(e):
+        raw = dashboard.compare_input.value or ""
+        symbols = list(dict.fromkeys(s.upper() for s in raw.replace(",", " ").split()))
+        index = backend.ready_symbol_index()
+        unknown = [symbol for symbol in symbols if index and index.is_unknown(symbol)]
+        symbols = [symbol for symbol in symbols if symbol not in unknown]
+        if view["series"] is None:
+            view["compare"] = symbols
+            return
+        dashboard.show_loading(True)
+        page.update()
+        await load_compare(symbols, get_days_for_range(view["time_range"]))
+        if unknown:
+            dashboard.compare_input.error_text = f"Unknown: {', '.join(unknown)}"
+        render_view()
+        save_session()
+        dashboard.show_loading(False)
+        page.update()
+
+    # Full history is parsed once per symbol, each time range is just a view of it
+    def get_series(symbol):
+        series = loaded_series.get(symbol)
+        if series is None:
+            with metrics.span("parse"):
+                series = OHLCVSeries.from_rows(cache.get(symbol))
+            loaded_series[symbol] = series
+            backend.hub.subscribe(("bars", symbol), on_bars)
+            if len(loaded_series) > MAX_LOADED_SERIES:
+                oldest = next(iter(loaded_series))
+                loaded_series.pop(oldest)
+                # Its indicator buffers go with it, so they are bounded the same way
+                indicator_cache.clear(oldest)
+                release(oldest)
+        return series
+
+    # Cancel a pending lookup once the user starts typing a different symbol
+    # and suggest matching symbols once they pause
+    async def on_symbol_change(e):
+        task = current_fetch["task"]
+        symbol = stock_symbol.current.value.upper().strip()
+        if task is not None and not task.done() and symbol != current_fetch["symbol"]:
+            task.cancel()
+
+        typing["generation"] += 1
+        generation = typing["generation"]
+        await asyncio.sleep(SUGGEST_DEBOUNCE)
+        if generation != typing["generation"]:
+            return
+        index = await backend.symbol_index()
+        if generation == typing["generation"]:
+            show_suggestions(index.suggest(stock_symbol.current.value) if index is not None else [])
+            suggestion_list.current.update()
+
+    def show_suggestions(matches):
+        suggestion_list.current.controls = [
+            ft.ListTile(
+                title=ft.Text(symbol, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
+                subtitle=ft.Text(f"{name} - {exchange}" if exchange else name, size=12, color=ft.Colors.GREY_600),
+                dense=True,
+                data=symbol,
+                on_click=pick_suggestion,
+            )
+            for symbol, name, exchange in matches
+        ]
+        suggestion_list.current.visible = bool(matches)
+
+    async def pick_suggestion(e):
+        stock_symbol.current.value = e.control.data
+        await fetch_stock_data(e)
+
+    def show_input_error(message):
+        error_messages.current.content = ft.Container(
+            content=ft.Row([
+                ft.Icon(ft.Icons.ERROR_OUTLINE, color=ft.Colors.RED_400, size=20),
+                ft.Text(message, color=ft.Colors.RED_700, size=14, weight=ft.FontWeight.W_500)
+            ], spacing=10),
+            padding=15,
+            bgcolor=ft.Colors.RED_50,
+            border_radius=10,
+            border=ft.border.all(1, ft.Colors.RED_200)
+        )
+        error_messages.current.visible = True
+        price_info.current.visible = False
+        price_text_below.current.visible = False
+        chart_container.current.visible = False
+        page.update()
+
     # Fetch the Stock with our API
-    def fetch_stock_data(e):
+    async def fetch_stock_data(e):
         symbol = stock_symbol.current.value.upper().strip()
         time_range = time_range_dropdown.current.value or "30 days"
         days = get_days_for_range(time_range)
 
+        # Pending suggestions are moot once a lookup starts
+        typing["generation"] += 1
+        show_suggestions([])
+
         # Mini error handle
         if not symbol:
-            error_messages.current.content = ft.Container(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.ERROR_OUTLINE, color=ft.Colors.RED_400, size=20),
-                    ft.Text("Please enter a stock symbol", color=ft.Colors.RED_700, size=14, weight=ft.FontWeight.W_500)
-                ], spacing=10),
-                padding=15,
-                bgcolor=ft.Colors.RED_50,
-                border_radius=10,
-                border=ft.border.all(1, ft.Colors.RED_200)
-            )
-            error_messages.current.visible = True
-            price_info.current.visible = False
-            price_text_below.current.visible = False
-            chart_container.current.visible = False
-            page.update()
+            show_input_error("Please enter a stock symbol")
+            return
+
+        # Unknown tickers are caught here, before spending an API call on them, once the listing is in
+        index = backend.ready_symbol_index()
+        if index and index.is_unknown(symbol):
+            matches = [match[0] for match in index.suggest(symbol, limit=3)]
+            show_input_error(f"Unknown symbol {symbol}" + (f". Did you mean {', '.join(matches)}?" if matches else ""))
             return
 
         error_messages.current.visible = False
+        started = time.perf_counter()
 
-        # Loading state with spinner
-        loading_spinner = ft.Column([
-            ft.ProgressRing(width=50, height=50, color=ft.Colors.BLUE_700),
-            ft.Text("Loading Stock Data...", color=ft.Colors.BLUE_700, size=16, weight=ft.FontWeight.W_500)
-        ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=15)
+        # A new lookup supersedes whatever was still loading
+        previous = current_fetch["task"]
+        if previous is not None and not previous.done():
+            previous.cancel()
+        current_fetch["task"] = asyncio.current_task()
+        current_fetch["symbol"] = symbol
 
-        chart_container.current.content = ft.Container(
-            content=loading_spinner,
-            padding=40,
-            alignment=ft.alignment.center
-        )
+        # Loading state with spinner
+        dashboard.show_loading(True)
         chart_container.current.visible = True
         price_info.current.visible = False
         price_text_below.current.visible = False
@@ -83,231 +396,44 @@ def main(page: ft.Page):
 
         # Fetch the API Data
         try:
-            url = f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY&symbol={symbol}&apikey={API_KEY}"
-            response = requests.get(url)
-            data = response.json()
-
-            time_series = data["Time Series (Daily)"]
-
-            dates = sorted(time_series.keys(), reverse=True)[:days]
-            dates.reverse()
-
-            # Prep the charts
-            opens, highs, lows, closes = [], [], [], []
+            # Serve from the local cache, only hitting the API when it is stale or too short.
+            # Stale data is shown right away and refreshed in the background (stale-while-revalidate).
+            stale = loader.plan(symbol, days) is not None and cache.last_date(symbol) is not None
+            if not stale:
+                with metrics.span("load"):
+                    if await loader.load(symbol, days):
+                        loaded_series.pop(symbol, None)
 
-            for date in dates:
-                day_data = time_series[date]
-                opens_price = float(day_data["1. open"])
-                high_price = float(day_data["2. high"])
-                low_price = float(day_data["3. low"])
-                close_price = float(day_data["4. close"])
-
-                opens.append(opens_price)
-                highs.append(high_price)
-                lows.append(low_price)
-                closes.append(close_price)
-
-            latest_date = sorted(time_series.keys(), reverse=True)[0]
-            latest_data = time_series[latest_date]
-
-            # Calculate price change
-            current_price = float(latest_data['4. close'])
-            previous_price = closes[-2] if len(closes) > 1 else current_price
-            price_change = current_price - previous_price
-            price_change_percent = (price_change / previous_price) * 100 if previous_price != 0 else 0
-            is_positive = price_change >= 0
-
-            # Update price info with enhanced styling
-            price_info.current.content = ft.Container(
-                content=ft.Column([
-                    # Stock header
-                    ft.Row([
-                        ft.Column([
-                            ft.Text(symbol, color=ft.Colors.GREY_900, size=32, weight=ft.FontWeight.BOLD),
-                            ft.Text(f"As of {latest_date}", color=ft.Colors.GREY_600, size=14),
-                        ], spacing=5),
-                        ft.Container(expand=True),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Text(f"${current_price:.2f}", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
-                                ft.Row([
-                                    ft.Icon(
-                                        ft.Icons.ARROW_UPWARD if is_positive else ft.Icons.ARROW_DOWNWARD,
-                                        size=16,
-                                        color=ft.Colors.GREEN_600 if is_positive else ft.Colors.RED_600
-                                    ),
-                                    ft.Text(
-                                        f"${abs(price_change):.2f} ({abs(price_change_percent):.2f}%)",
-                                        size=16,
-                                        weight=ft.FontWeight.W_500,
-                                        color=ft.Colors.GREEN_600 if is_positive else ft.Colors.RED_600
-                                    )
-                                ], spacing=5)
-                            ], horizontal_alignment=ft.CrossAxisAlignment.END, spacing=5)
-                        )
-                    ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
-
-                    ft.Divider(height=1, color=ft.Colors.GREY_300),
-
-                    # Price cards
-                    ft.Row([
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([
-                                    ft.Icon(ft.Icons.PLAY_ARROW, color=ft.Colors.BLUE_700, size=16),
-                                    ft.Text("Open", size=13, color=ft.Colors.BLUE_800, weight=ft.FontWeight.W_500)
-                                ], spacing=5),
-                                ft.Text(f"${float(latest_data['1. open']):.2f}", size=24, weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.BLUE_900),
-                            ], spacing=8),
-                            padding=20,
-                            bgcolor=ft.Colors.BLUE_50,
-                            border_radius=12,
-                            expand=True,
-                            shadow=ft.BoxShadow(
-                                spread_radius=0,
-                                blur_radius=10,
-                                color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
-                                offset=ft.Offset(0, 2)
-                            )
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([
-                                    ft.Icon(ft.Icons.TRENDING_UP, color=ft.Colors.GREEN_700, size=16),
-                                    ft.Text("High", size=13, color=ft.Colors.GREEN_800, weight=ft.FontWeight.W_500)
-                                ], spacing=5),
-                                ft.Text(f"${float(latest_data['2. high']):.2f}", size=24, weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.GREEN_900),
-                            ], spacing=8),
-                            padding=20,
-                            bgcolor=ft.Colors.GREEN_50,
-                            border_radius=12,
-                            expand=True,
-                            shadow=ft.BoxShadow(
-                                spread_radius=0,
-                                blur_radius=10,
-                                color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
-                                offset=ft.Offset(0, 2)
-                            )
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([
-                                    ft.Icon(ft.Icons.TRENDING_DOWN, color=ft.Colors.RED_700, size=16),
-                                    ft.Text("Low", size=13, color=ft.Colors.RED_800, weight=ft.FontWeight.W_500)
-                                ], spacing=5),
-                                ft.Text(f"${float(latest_data['3. low']):.2f}", size=24, weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.RED_900),
-                            ], spacing=8),
-                            padding=20,
-                            bgcolor=ft.Colors.RED_50,
-                            border_radius=12,
-                            expand=True,
-                            shadow=ft.BoxShadow(
-                                spread_radius=0,
-                                blur_radius=10,
-                                color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
-                                offset=ft.Offset(0, 2)
-                            )
-                        ),
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([
-                                    ft.Icon(ft.Icons.STOP_CIRCLE_OUTLINED, color=ft.Colors.PURPLE_700, size=16),
-                                    ft.Text("Close", size=13, color=ft.Colors.PURPLE_800, weight=ft.FontWeight.W_500)
-                                ], spacing=5),
-                                ft.Text(f"${float(latest_data['4. close']):.2f}", size=24, weight=ft.FontWeight.BOLD,
-                                        color=ft.Colors.PURPLE_900),
-                            ], spacing=8),
-                            padding=20,
-                            bgcolor=ft.Colors.PURPLE_50,
-                            border_radius=12,
-                            expand=True,
-                            shadow=ft.BoxShadow(
-                                spread_radius=0,
-                                blur_radius=10,
-                                color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
-                                offset=ft.Offset(0, 2)
-                            )
-                        ),
-                    ], spacing=15)
-                ], spacing=20),
-                padding=25,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=15,
-                shadow=ft.BoxShadow(
-                    spread_radius=0,
-                    blur_radius=20,
-                    color=ft.Colors.with_opacity(0.1, ft.Colors.BLACK),
-                    offset=ft.Offset(0, 4)
-                )
-            )
+            if view["compare"]:
+                await load_compare(view["compare"], days)
+            series = get_series(symbol)
+            view.update(symbol=symbol, series=series, time_range=time_range)
+            with metrics.span("render"):
+                render_view()
+            # Started once the view shows this symbol, so even a refresh that finishes right away
+            # finds it on screen and replaces the "refreshing..." status
+            if stale:
+                start_refresh(symbol, days)
+            show_freshness(symbol, "refreshing..." if stale else None)
+            save_session()
             price_info.current.visible = True
-
-            # Enhanced chart
-            chart = ft.LineChart(
-                data_series=[
-                    ft.LineChartData(
-                        data_points=[
-                            ft.LineChartDataPoint(i, closes[i])
-                            for i in range(len(closes))
-                        ],
-                        stroke_width=3,
-                        color=ft.Colors.BLUE_700,
-                        curved=True,
-                        stroke_cap_round=True,
-                        below_line_bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.BLUE_700),
-                    ),
-                ],
-                border=ft.Border(
-                    bottom=ft.BorderSide(2, ft.Colors.GREY_300),
-                    left=ft.BorderSide(2, ft.Colors.GREY_300),
-                ),
-                left_axis=ft.ChartAxis(
-                    labels_size=50,
-                ),
-                bottom_axis=ft.ChartAxis(
-                    labels_size=40,
-                    labels_interval=max(1, len(closes) // 10),
-                ),
-                tooltip_bgcolor=ft.Colors.with_opacity(.9, ft.Colors.GREY_900),
-                min_y=min(closes) * .95,
-                max_y=max(closes) * 1.05,
-                min_x=0,
-                max_x=len(closes) - 1,
-                expand=True
-            )
-
-            chart_container.current.content = ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Icon(ft.Icons.SHOW_CHART, color=ft.Colors.BLUE_700, size=24),
-                        ft.Text(f"Closing Price - {get_range_label(time_range)}",
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                                color=ft.Colors.GREY_900),
-                    ], spacing=10),
-                    ft.Container(
-                        content=chart,
-                        padding=ft.padding.only(top=20, right=10, bottom=10, left=0),
-                        height=350
-                    )
-                ], spacing=15),
-                padding=25,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=15,
-                shadow=ft.BoxShadow(
-                    spread_radius=0,
-                    blur_radius=20,
-                    color=ft.Colors.with_opacity(0.1, ft.Colors.BLACK),
-                    offset=ft.Offset(0, 4)
-                )
-            )
+            if live_switch.current.value and live["symbol"] != symbol:
+                start_live(symbol)
+            dashboard.show_loading(False)
             chart_container.current.visible = True
             price_text_below.current.visible = False
 
+        except asyncio.CancelledError:
+            # Superseded: drop the spinner unless a newer lookup already owns the page
+            if current_fetch["task"] is asyncio.current_task():
+                chart_container.current.visible = False
+                current_fetch["task"] = None
+                page.update()
+            raise
+
         except Exception as e:
+            if backend.provider.is_timeout(e):
+                e = f"Request for {symbol} timed out, please try again"
             error_messages.current.content = ft.Container(
                 content=ft.Column([
                     ft.Row([
@@ -332,38 +458,435 @@ def main(page: ft.Page):
             price_text_below.current.visible = False
             chart_container.current.visible = False
 
+        with metrics.span("page_update"):
+            page.update()
+        metrics.record("total", time.perf_counter() - started)
+        publish_metrics()
+
+    def show_freshness(symbol, status=None, stale=False):
+        fetched_at = cache.fetched_at(symbol)
+        text = f"Updated {format_age(time.time() - fetched_at)}" if fetched_at else "Imported data"
+        dashboard.show_freshness(f"{text}, {status}" if status else text, stale or status is not None)
+
+    # Remembered for the next start, which draws it from the cache before anything is fetched
+    def save_session():
+        save_snapshot({
+            "symbol": view["symbol"],
+            "time_range": view["time_range"],
+            "compare": view["compare"],
+            "watchlist": watchlist["order"],
+        })
+
+    def start_refresh(symbol, days):
+        task = refresh["task"]
+        if task is not None and not task.done():
+            task.cancel()
+        refresh["task"] = asyncio.ensure_future(refresh_stale(symbol, days))
+
+    # Bring stale data on screen up to date; the chart itself is redrawn by on_bars once new bars land
+    async def refresh_stale(symbol, days):
+        try:
+            await loader.load(symbol, days)
+            status = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = f"refresh failed: {e}"
+        if view["symbol"] == symbol:
+            show_freshness(symbol, status, stale=status is not None)
+            page.update()
+
+    # Export / import of cached history through the native file dialogs
+    def on_export_path(e):
+        if not e.path:
+            return
+        symbols = [view["symbol"]] if view["symbol"] else None
+        try:
+            count = export_history(e.path, symbols, cache)
+            message = f"Exported {count} bars to {e.path}"
+        except Exception as error:
+            message = f"Export failed: {error}"
+        page.open(ft.SnackBar(ft.Text(message)))
+
+    def on_import_files(e):
+        if not e.files:
+            return
+        try:
+            count = sum(import_history(f.path, cache) for f in e.files)
+            loaded_series.clear()
+            message = f"Imported {count} bars"
+        except Exception as error:
+            message = f"Import failed: {error}"
+        page.open(ft.SnackBar(ft.Text(message)))
+
+    export_picker = ft.FilePicker(on_result=on_export_path)
+    import_picker = ft.FilePicker(on_result=on_import_files)
+    page.overlay.extend([export_picker, import_picker])
+    extensions = [extension.lstrip(".") for extension in FORMATS]
+
+    # Live mode: poll quotes for the symbol on screen and append them to the live panel
+    # The polling itself is shared: sessions watching the same symbol all get the same ticks
+    def start_live(symbol):
+        if live["symbol"] is not None:
+            backend.unwatch_live(live["symbol"], on_live_ticks, on_live_error)
+        live["symbol"] = symbol
+        dashboard.show_live(symbol)
+        if symbol is not None:
+            backend.watch_live(symbol, on_live_ticks, on_live_error)
+
+    # Async so live polling is started on the event loop rather than a handler thread
+    async def toggle_live(e):
+        start_live(view["symbol"] if live_switch.current.value else None)
         page.update()
 
-    # UI Layout
-    page.add(
-        ft.Column([
-            # Header with gradient
-            ft.Container(
-                content=ft.Column([
-                    ft.Row([
-                        ft.Icon(ft.Icons.TRENDING_UP, size=36, color=ft.Colors.WHITE),
-                        ft.Text("Jonathan Stocks", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
-                    ], spacing=12),
-                    ft.Text("Real-time stock market data and visualization",
-                            size=16,
-                            color=ft.Colors.with_opacity(0.9, ft.Colors.WHITE),
-                            weight=ft.FontWeight.W_400)
-                ], spacing=8, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=40,
-                gradient=ft.LinearGradient(
-                    begin=ft.alignment.top_left,
-                    end=ft.alignment.bottom_right,
-                    colors=[ft.Colors.BLUE_700, ft.Colors.BLUE_900]
-                ),
-                alignment=ft.alignment.center
+    def on_live_ticks(symbol, buffer, first):
+        if symbol != live["symbol"]:
+            return
+        # Only the new ticks are sent; the y range comes from the (fixed size) buffer
+        seqs, _, prices, _ = buffer.since(first)
+        _, _, window, _ = buffer.since()
+        if not len(seqs):
+            return
+        dashboard.live_title.value = f"Live - {symbol}"
+        dashboard.append_live(seqs.tolist(), prices.tolist(), buffer.capacity, float(window.min()), float(window.max()))
+
+        # Change against the last daily close before today
+        series = view["series"]
+        if view["symbol"] == symbol and series is not None:
+            before = series.close[:np.searchsorted(series.dates, np.datetime64("today", "D"))]
+            if len(before):
+                price = float(prices[-1])
+                reference = float(before[-1])
+                price_change = price - reference
+                price_change_percent = (price_change / reference) * 100 if reference != 0 else 0
+                dashboard.show_live_price(price, price_change, price_change_percent)
+                notify_alerts(alert_engine.update(symbol, price, price_change_percent))
+        page.update()
+
+    def on_live_error(symbol, error):
+        if symbol == live["symbol"]:
+            dashboard.live_title.value = f"Live - {symbol} (last update failed: {error})"
+            page.update()
+
+    # Watchlist row: symbol on the left, price and change filled in once the data arrives
+    def build_watchlist_row(symbol):
+        price = ft.Text("Loading...", size=16, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_600)
+        change = ft.Text("", size=14, weight=ft.FontWeight.W_500)
+        row = ft.Container(
+            content=ft.Row([
+                ft.Text(symbol, size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
+                ft.Container(expand=True),
+                price,
+                ft.Container(content=change, width=140, alignment=ft.alignment.center_right),
+            ]),
+            data=symbol,
+            height=WATCHLIST_ROW_HEIGHT,
+            padding=ft.padding.symmetric(horizontal=15),
+            border=ft.border.only(bottom=ft.BorderSide(1, ft.Colors.GREY_200)),
+            on_click=open_watchlist_symbol,
+        )
+        watchlist["rows"][symbol] = (row, price, change)
+        return row
+
+    # Called by the scheduler as each symbol finishes, so rows fill in one by one
+    # A failed refresh still shows the cached bars if there are any, in amber
+    def on_watchlist_result(symbol, bars, error):
+        if symbol not in watchlist["rows"]:
+            return
+        latest = (bars[-1][4], bars[-2][4] if len(bars) > 1 else bars[-1][4]) if bars else None
+        fill_watchlist_row(symbol, latest, error)
+        # Only this row is sent to the client
+        watchlist["rows"][symbol][0].update()
+
+    # `latest` is (close, previous close), or None when there is nothing to show
+    def fill_watchlist_row(symbol, latest, error=None):
+        row, price, change = watchlist["rows"][symbol]
+        row.tooltip = str(error) if error is not None else None
+        if latest is None:
+            price.value = "Unavailable"
+            price.color = ft.Colors.RED_600
+        else:
+            current_price, previous_price = latest
+            price_change = current_price - previous_price
+            price_change_percent = (price_change / previous_price) * 100 if previous_price != 0 else 0
+            is_positive = price_change >= 0
+            price.value = f"${current_price:.2f}"
+            price.color = ft.Colors.GREY_900 if error is None else ft.Colors.AMBER_800
+            change.value = f"{'+' if is_positive else '-'}${abs(price_change):.2f} ({abs(price_change_percent):.2f}%)"
+            change.color = ft.Colors.GREEN_600 if is_positive else ft.Colors.RED_600
+
+    async def load_watchlist(e):
+        raw = watchlist_input.current.value or ""
+        symbols = list(dict.fromkeys(s.upper() for s in raw.replace(",", " ").split()))
+        show_watchlist(symbols)
+        page.update()
+        save_session()
+        await schedule_watchlist(symbols)
+
+    # Rows for `symbols`, with whatever prices the cache already has (one query for the whole list)
+    def show_watchlist(symbols):
+        if watchlist["scheduler"] is None:
+            watchlist["scheduler"] = WatchlistScheduler(loader, on_watchlist_result)
+        scheduler = watchlist["scheduler"]
+        scheduler.stop()
+
+        previous = watchlist["rows"]
+        watchlist["order"] = symbols
+        watchlist["rows"] = {}
+        for symbol in previous:
+            release(symbol)
+        watchlist_rows.current.controls = [build_watchlist_row(symbol) for symbol in symbols]
+        # Rows also refresh when another session downloads one of these symbols
+        for symbol in symbols:
+            backend.hub.subscribe(("bars", symbol), on_bars)
+        if symbols:
+            for symbol, latest in cache.latest_closes(symbols).items():
+                fill_watchlist_row(symbol, latest)
+        watchlist_rows.current.visible = bool(symbols)
+
+    async def schedule_watchlist(symbols):
+        scheduler = watchlist["scheduler"]
+        # Unknown tickers are flagged right away instead of being queued for the API
+        index = backend.ready_symbol_index()
+        if index:
+            for symbol in symbols:
+                if index.is_unknown(symbol):
+                    on_watchlist_result(symbol, None, ValueError(f"Unknown symbol {symbol}"))
+            symbols = [symbol for symbol in symbols if not index.is_unknown(symbol)]
+
+        # Rows on screen first, the rest in list order
+        visible = WATCHLIST_HEIGHT // WATCHLIST_ROW_HEIGHT + 1
+        for i, symbol in enumerate(symbols):
+            scheduler.submit(symbol, priority=0 if i < visible else 1)
+        scheduler.start()
+
+    async def on_watchlist_scroll(e):
+        scheduler = watchlist["scheduler"]
+        if scheduler is None or e.viewport_dimension is None:
+            return
+        first = int(e.pixels // WATCHLIST_ROW_HEIGHT)
+        count = int(e.viewport_dimension // WATCHLIST_ROW_HEIGHT) + 1
+        scheduler.prioritize(watchlist["order"][first:first + count])
+
+    async def open_watchlist_symbol(e):
+        stock_symbol.current.value = e.control.data
+        stock_symbol.current.update()
+        await fetch_stock_data(e)
+
+    # Portfolio: one row per holding, all revalued together whenever any price comes in
+    def build_holding_row(symbol):
+        cells = [ft.Text("", size=14, width=110, text_align=ft.TextAlign.RIGHT) for _ in range(4)]
+        row = ft.Container(
+            content=ft.Row([
+                ft.Text(symbol, size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900, width=90),
+                ft.Container(expand=True),
+                *cells,
+                ft.IconButton(icon=ft.Icons.DELETE_OUTLINE, icon_size=18, data=symbol, on_click=remove_holding,
+                              tooltip="Remove holding"),
+            ]),
+            height=WATCHLIST_ROW_HEIGHT,
+            padding=ft.padding.symmetric(horizontal=15),
+            border=ft.border.only(bottom=ft.BorderSide(1, ft.Colors.GREY_200)),
+        )
+        tracked["rows"][symbol] = (row, cells)
+        return row
+
+    def refresh_portfolio():
+        holdings_list.current.controls = [
+            tracked["rows"][symbol][0] if symbol in tracked["rows"] else build_holding_row(symbol)
+            for symbol in portfolio.symbols
+        ]
+        holdings_list.current.visible = bool(portfolio.symbols)
+        valuation = portfolio.value(cache.latest_closes(portfolio.symbols))
+        for i, symbol in enumerate(portfolio.symbols):
+            quantity, price, change, pnl = tracked["rows"][symbol][1]
+            quantity.value = f"{portfolio.quantity[i]:g} sh"
+            if np.isnan(valuation.price[i]):
+                price.value, change.value, pnl.value = "Loading...", "", ""
+                continue
+            price.value = f"${valuation.price[i]:.2f}"
+            change.value = f"{valuation.price_change_percent[i]:+.2f}%"
+            change.color = ft.Colors.GREEN_600 if valuation.price_change[i] >= 0 else ft.Colors.RED_600
+            pnl.value = f"{'+' if valuation.pnl[i] >= 0 else '-'}${abs(valuation.pnl[i]):,.2f}"
+            pnl.color = ft.Colors.GREEN_600 if valuation.pnl[i] >= 0 else ft.Colors.RED_600
+        portfolio_totals.current.value = (
+            f"Value ${valuation.total_value:,.2f}   Today {valuation.total_day_pnl:+,.2f}   "
+            f"P&L {valuation.total_pnl:+,.2f} ({valuation.total_pnl_percent:+.2f}%)"
+            if portfolio.symbols else ""
+        )
+
+    def refresh_alerts():
+        alerts_list.current.controls = [
+            ft.Row([
+                ft.Icon(ft.Icons.NOTIFICATIONS_NONE, size=18, color=ft.Colors.BLUE_700),
+                ft.Text(describe(alert), size=14, color=ft.Colors.GREY_800, expand=True),
+                ft.IconButton(icon=ft.Icons.DELETE_OUTLINE, icon_size=18, data=alert, on_click=remove_alert,
+                              tooltip="Remove alert"),
+            ])
+            for alert in alert_engine
+        ]
+
+    def notify_alerts(fired):
+        if fired:
+            page.open(ft.SnackBar(ft.Text("Alert: " + "; ".join(describe(alert) for alert in fired))))
+
+    # Prices for every holding and alert symbol come through a scheduler, like the watchlist
+    async def track_symbols():
+        symbols = set(portfolio.symbols) | set(alert_engine.symbols())
+        for symbol in tracked["symbols"] - symbols:
+            tracked["symbols"].discard(symbol)
+            release(symbol)
+        if tracked["scheduler"] is None:
+            tracked["scheduler"] = WatchlistScheduler(loader, on_tracked_result)
+        for symbol in symbols - tracked["symbols"]:
+            tracked["symbols"].add(symbol)
+            backend.hub.subscribe(("bars", symbol), on_bars)
+            tracked["scheduler"].submit(symbol)
+        tracked["scheduler"].start()
+
+    def on_tracked_result(symbol, bars, error):
+        if symbol not in tracked["symbols"]:
+            return
+        if bars:
+            current_price = bars[-1][4]
+            previous_price = bars[-2][4] if len(bars) > 1 else current_price
+            change = (current_price - previous_price) / previous_price * 100 if previous_price != 0 else 0
+            notify_alerts(alert_engine.update(symbol, current_price, change))
+        if symbol in portfolio.symbols:
+            refresh_portfolio()
+        page.update()
+
+    async def add_holding(e):
+        symbol_input, quantity_input, cost_input = (ref.current for ref in holding_inputs)
+        symbol = (symbol_input.value or "").upper().strip()
+        try:
+            quantity, cost = float(quantity_input.value), float(cost_input.value)
+        except (TypeError, ValueError):
+            quantity_input.error_text = "Enter shares and cost per share"
+            page.update()
+            return
+        index = backend.ready_symbol_index()
+        if not symbol or (index and index.is_unknown(symbol)):
+            symbol_input.error_text = "Unknown symbol"
+            page.update()
+            return
+        symbol_input.error_text = quantity_input.error_text = None
+        portfolio.add(symbol, quantity, cost)
+        portfolio.save()
+        symbol_input.value = quantity_input.value = cost_input.value = ""
+        refresh_portfolio()
+        page.update()
+        await track_symbols()
+
+    async def remove_holding(e):
+        portfolio.remove(e.control.data)
+        portfolio.save()
+        tracked["rows"].pop(e.control.data, None)
+        refresh_portfolio()
+        page.update()
+        await track_symbols()
+
+    async def add_alert(e):
+        symbol_input, kind_input, threshold_input = (ref.current for ref in alert_inputs)
+        symbol = (symbol_input.value or "").upper().strip()
+        try:
+            threshold = float(threshold_input.value)
+        except (TypeError, ValueError):
+            threshold_input.error_text = "Enter a number"
+            page.update()
+            return
+        index = backend.ready_symbol_index()
+        if not symbol or (index and index.is_unknown(symbol)):
+            symbol_input.error_text = "Unknown symbol"
+            page.update()
+            return
+        symbol_input.error_text = threshold_input.error_text = None
+        metric, direction = kind_input.value.split()
+        alert_engine.add(Alert(symbol, metric, direction, threshold))
+        alert_engine.save()
+        symbol_input.value = threshold_input.value = ""
+        refresh_alerts()
+        page.update()
+        await track_symbols()
+
+    async def remove_alert(e):
+        alert_engine.remove(e.control.data)
+        alert_engine.save()
+        refresh_alerts()
+        page.update()
+        await track_symbols()
+
+    # Warm start: the saved watchlist and chart are drawn from the cache into the layout before it is
+    # first sent. Returns the background work, as (handler, *args), that then brings them up to date.
+    def restore_session(snapshot):
+        pending = []
+        symbols = snapshot.get("watchlist") or []
+        if symbols:
+            watchlist_input.current.value = ", ".join(symbols)
+            show_watchlist(symbols)
+            pending.append((schedule_watchlist, symbols))
+
+        symbol = snapshot.get("symbol")
+        if not symbol:
+            return pending
+        time_range = snapshot.get("time_range") or "30 days"
+        stock_symbol.current.value = symbol
+        time_range_dropdown.current.value = time_range
+        view["compare"] = snapshot.get("compare") or []
+        dashboard.compare_input.value = ", ".join(view["compare"])
+        # Nothing cached to draw (e.g. evicted since): look it up as if it had just been entered
+        if cache.last_date(symbol) is None:
+            pending.append((fetch_stock_data, None))
+            return pending
+
+        days = get_days_for_range(time_range)
+        view.update(symbol=symbol, series=get_series(symbol), time_range=time_range)
+        render_view()
+        stale = loader.plan(symbol, days) is not None
+        show_freshness(symbol, "refreshing..." if stale else None)
+        price_info.current.visible = True
+        chart_container.current.visible = True
+        pending.append((refresh_session, symbol, days, stale))
+        return pending
+
+    async def refresh_session(symbol, days, stale):
+        if stale:
+            start_refresh(symbol, days)
+        # Compared symbols are redrawn by on_bars as their bars land; only failures need showing here
+        if view["compare"]:
+            await load_compare(view["compare"], days)
+            page.update()
+
+    # UI Layout, built before it is added so a restored session is part of the first frame
+    layout = ft.Column([
+        # Header with gradient
+        ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.TRENDING_UP, size=36, color=ft.Colors.WHITE),
+                    ft.Text("Jonathan Stocks", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+                ], spacing=12),
+                ft.Text("Real-time stock market data and visualization",
+                        size=16,
+                        color=ft.Colors.with_opacity(0.9, ft.Colors.WHITE),
+                        weight=ft.FontWeight.W_400)
+            ], spacing=8, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=40,
+            gradient=ft.LinearGradient(
+                begin=ft.alignment.top_left,
+                end=ft.alignment.bottom_right,
+                colors=[ft.Colors.BLUE_700, ft.Colors.BLUE_900]
             ),
+            alignment=ft.alignment.center
+        ),
 
-            # Main content area
-            ft.Container(
-                content=ft.Column([
-                    # Search controls
-                    ft.Container(
-                        content=ft.Row([
+        # Main content area
+        ft.Container(
+            content=ft.Column([
+                # Search controls
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([
                             ft.TextField(
                                 ref=stock_symbol,
                                 label="Stock Symbol",
@@ -371,6 +894,7 @@ def main(page: ft.Page):
                                 width=280,
                                 autofocus=True,
                                 on_submit=fetch_stock_data,
+                                on_change=on_symbol_change,
                                 border_radius=10,
                                 prefix_icon=ft.Icons.SEARCH,
                                 bgcolor=ft.Colors.WHITE,
@@ -407,48 +931,267 @@ def main(page: ft.Page):
                                 ),
                                 height=56,
                             ),
+                            ft.Switch(
+                                ref=live_switch,
+                                label="Live",
+                                value=False,
+                                on_change=toggle_live,
+                                active_color=ft.Colors.GREEN_600,
+                            ),
+                            ft.IconButton(
+                                icon=ft.Icons.DOWNLOAD,
+                                tooltip="Export history (current symbol, or everything cached)",
+                                on_click=lambda e: export_picker.save_file(
+                                    dialog_title="Export history",
+                                    file_name=f"{view['symbol'] or 'history'}.csv",
+                                    allowed_extensions=extensions,
+                                ),
+                            ),
+                            ft.IconButton(
+                                icon=ft.Icons.UPLOAD,
+                                tooltip="Import history",
+                                on_click=lambda e: import_picker.pick_files(
+                                    dialog_title="Import history",
+                                    allowed_extensions=extensions,
+                                    allow_multiple=True,
+                                ),
+                            ),
                         ], spacing=15, alignment=ft.MainAxisAlignment.CENTER),
-                        padding=30,
-                        bgcolor=ft.Colors.WHITE,
-                        border_radius=15,
-                        shadow=ft.BoxShadow(
-                            spread_radius=0,
-                            blur_radius=20,
-                            color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
-                            offset=ft.Offset(0, 4)
-                        )
-                    ),
-
-                    # Error messages
-                    ft.Container(
-                        ref=error_messages,
-                        content=ft.Text(""),
-                        visible=False
-                    ),
-
-                    # Price info
-                    ft.Container(
-                        ref=price_info,
-                        visible=False
-                    ),
-
-                    # Chart container
-                    ft.Container(
-                        ref=chart_container,
-                        visible=False
-                    ),
-
-                    # Price text below (hidden in new design)
-                    ft.Container(
-                        ref=price_text_below,
-                        visible=False
-                    ),
-                ], spacing=25),
-                padding=30,
-                expand=True
-            )
-        ], spacing=0, scroll=ft.ScrollMode.AUTO)
-    )
+                        # Symbol suggestions while typing
+                        ft.Column(ref=suggestion_list, spacing=0, width=600, visible=False),
+                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                    padding=30,
+                    bgcolor=ft.Colors.WHITE,
+                    border_radius=15,
+                    shadow=ft.BoxShadow(
+                        spread_radius=0,
+                        blur_radius=20,
+                        color=ft.Colors.with_opacity(0.08, ft.Colors.BLACK),
+                        offset=ft.Offset(0, 4)
+                    )
+                ),
+
+                # Error messages
+                ft.Container(
+                    ref=error_messages,
+                    content=ft.Text(""),
+                    visible=False
+                ),
+
+                # Price info
+                ft.Container(
+                    ref=price_info,
+                    content=dashboard.price_card,
+                    visible=False
+                ),
+
+                # Chart container
+                ft.Container(
+                    ref=chart_container,
+                    content=dashboard.chart_card,
+                    visible=False
+                ),
+
+                # Price text below (hidden in new design)
+                ft.Container(
+                    ref=price_text_below,
+                    visible=False
+                ),
+
+                # Watchlist
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([
+                            ft.Icon(ft.Icons.LIST_ALT, color=ft.Colors.BLUE_700, size=24),
+                            ft.Text("Watchlist", size=20, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
+                        ], spacing=10),
+                        ft.Row([
+                            ft.TextField(
+                                ref=watchlist_input,
+                                label="Symbols",
+                                hint_text="AAPL, MSFT, NVDA, AMZN",
+                                expand=True,
+                                on_submit=load_watchlist,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.ElevatedButton(
+                                "Load Watchlist",
+                                icon=ft.Icons.PLAYLIST_ADD,
+                                on_click=load_watchlist,
+                                style=ft.ButtonStyle(
+                                    color=ft.Colors.WHITE,
+                                    bgcolor=ft.Colors.BLUE_700,
+                                    padding=20,
+                                    shape=ft.RoundedRectangleBorder(radius=10),
+                                ),
+                                height=56,
+                            ),
+                        ], spacing=15),
+                        ft.ListView(
+                            ref=watchlist_rows,
+                            height=WATCHLIST_HEIGHT,
+                            item_extent=WATCHLIST_ROW_HEIGHT,
+                            on_scroll=on_watchlist_scroll,
+                            on_scroll_interval=100,
+                            visible=False,
+                        ),
+                    ], spacing=15),
+                    padding=25,
+                    bgcolor=ft.Colors.WHITE,
+                    border_radius=15,
+                    shadow=ft.BoxShadow(
+                        spread_radius=0,
+                        blur_radius=20,
+                        color=ft.Colors.with_opacity(0.1, ft.Colors.BLACK),
+                        offset=ft.Offset(0, 4)
+                    )
+                ),
+
+                # Portfolio and alerts
+                ft.Container(
+                    content=ft.Column([
+                        ft.Row([
+                            ft.Icon(ft.Icons.ACCOUNT_BALANCE_WALLET, color=ft.Colors.BLUE_700, size=24),
+                            ft.Text("Portfolio", size=20, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
+                            ft.Container(expand=True),
+                            ft.Text(ref=portfolio_totals, size=14, weight=ft.FontWeight.W_500,
+                                    color=ft.Colors.GREY_800),
+                        ], spacing=10),
+                        ft.Row([
+                            ft.TextField(
+                                ref=holding_inputs[0],
+                                label="Symbol",
+                                width=140,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.TextField(
+                                ref=holding_inputs[1],
+                                label="Shares",
+                                width=140,
+                                keyboard_type=ft.KeyboardType.NUMBER,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.TextField(
+                                ref=holding_inputs[2],
+                                label="Cost per share",
+                                width=160,
+                                keyboard_type=ft.KeyboardType.NUMBER,
+                                on_submit=add_holding,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.ElevatedButton(
+                                "Add Holding",
+                                icon=ft.Icons.ADD,
+                                on_click=add_holding,
+                                style=ft.ButtonStyle(
+                                    color=ft.Colors.WHITE,
+                                    bgcolor=ft.Colors.BLUE_700,
+                                    padding=20,
+                                    shape=ft.RoundedRectangleBorder(radius=10),
+                                ),
+                                height=56,
+                            ),
+                        ], spacing=15, wrap=True),
+                        ft.Column(ref=holdings_list, spacing=0, visible=False),
+                        ft.Divider(height=1, color=ft.Colors.GREY_300),
+                        ft.Row([
+                            ft.Icon(ft.Icons.NOTIFICATIONS_ACTIVE, color=ft.Colors.BLUE_700, size=20),
+                            ft.Text("Alerts", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900),
+                        ], spacing=10),
+                        ft.Row([
+                            ft.TextField(
+                                ref=alert_inputs[0],
+                                label="Symbol",
+                                width=140,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.Dropdown(
+                                ref=alert_inputs[1],
+                                label="When",
+                                width=200,
+                                options=[
+                                    ft.dropdown.Option("price above", "Price rises to"),
+                                    ft.dropdown.Option("price below", "Price falls to"),
+                                    ft.dropdown.Option("change above", "Day change % above"),
+                                    ft.dropdown.Option("change below", "Day change % below"),
+                                ],
+                                value="price above",
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.TextField(
+                                ref=alert_inputs[2],
+                                label="Threshold",
+                                width=140,
+                                keyboard_type=ft.KeyboardType.NUMBER,
+                                on_submit=add_alert,
+                                border_radius=10,
+                                bgcolor=ft.Colors.WHITE,
+                                border_color=ft.Colors.GREY_300,
+                                focused_border_color=ft.Colors.BLUE_700,
+                            ),
+                            ft.ElevatedButton(
+                                "Add Alert",
+                                icon=ft.Icons.ADD_ALERT,
+                                on_click=add_alert,
+                                style=ft.ButtonStyle(
+                                    color=ft.Colors.WHITE,
+                                    bgcolor=ft.Colors.BLUE_700,
+                                    padding=20,
+                                    shape=ft.RoundedRectangleBorder(radius=10),
+                                ),
+                                height=56,
+                            ),
+                        ], spacing=15, wrap=True),
+                        ft.Column(ref=alerts_list, spacing=0),
+                    ], spacing=15),
+                    padding=25,
+                    bgcolor=ft.Colors.WHITE,
+                    border_radius=15,
+                    shadow=ft.BoxShadow(
+                        spread_radius=0,
+                        blur_radius=20,
+                        color=ft.Colors.with_opacity(0.1, ft.Colors.BLACK),
+                        offset=ft.Offset(0, 4)
+                    )
+                ),
+            ], spacing=25),
+            padding=30,
+            expand=True
+        )
+    ], spacing=0, scroll=ft.ScrollMode.AUTO)
+
+    # Saved holdings and alerts, and whatever the last session was looking at, are in the first frame;
+    # their prices are brought up to date once it is on screen
+    refresh_portfolio()
+    refresh_alerts()
+    pending = restore_session(load_snapshot())
+    page.add(layout)
+    for handler, *args in pending:
+        page.run_task(handler, *args)
+    if len(portfolio) or len(alert_engine):
+        page.run_task(track_symbols)
 
 if __name__ == '__main__':
-    ft.app(target=main)
+    # SERVER_MODE=1 serves the app to browsers; every session shares this process's backend
+    if SERVER_MODE:
+        ft.app(target=main, view=ft.AppView.WEB_BROWSER, port=SERVER_PORT)
+    else:
+        ft.app(target=main)
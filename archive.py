@@ -0,0 +1,177 @@
+# Bulk export / import of cached daily history: CSV, Parquet, Arrow IPC, or memory-mapped NumPy (.npy)
+# python archive.py export history.parquet AAPL MSFT     (no symbols: everything in the cache)
+# python archive.py import history.parquet
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from cache import StockCache
+
+
+# `full` marks bars of a symbol whose complete history was cached (exports from before it have no such
+# column and import as partial, so the app still downloads the full history once)
+COLUMNS = ("symbol", "date", "open", "high", "low", "close", "volume", "full")
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow", ".npy": "npy"}
+CHUNK_SIZE = 50_000
+
+
+def detect_format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Unknown export format for {path}, use one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+# pyarrow is only needed for Parquet and Arrow files
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet and Arrow files need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _npy_dtype(symbol_width):
+    return np.dtype([
+        ("symbol", f"U{symbol_width}"), ("date", "datetime64[D]"),
+        ("open", "f8"), ("high", "f8"), ("low", "f8"), ("close", "f8"), ("volume", "i8"), ("full", "?"),
+    ])
+
+
+# Rows are written chunk by chunk as they come out of the cache; returns the number of rows
+def export_history(path, symbols=None, cache=None, chunk_size=CHUNK_SIZE):
+    cache = cache or StockCache()
+    fmt = detect_format(path)
+    full = cache.full_symbols()
+    chunks = (
+        [(*row, row[0] in full) for row in rows]
+        for rows in cache.iter_bars(symbols, chunk_size=chunk_size)
+    )
+    written = 0
+
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for rows in chunks:
+                writer.writerows((*row[:-1], int(row[-1])) for row in rows)
+                written += len(rows)
+
+    elif fmt == "npy":
+        # The file is sized up front and filled through a memory map, so only one chunk is in memory
+        total = cache.count(symbols)
+        width = max([len(s) for s in symbols or cache.symbols()] or [1])
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=_npy_dtype(width), shape=(total,))
+        for rows in chunks:
+            # Guard against bars added since counting
+            rows = rows[:total - written]
+            out[written:written + len(rows)] = rows
+            written += len(rows)
+        out.flush()
+        del out
+
+    else:
+        pa = _pyarrow()
+        schema = pa.schema([
+            ("symbol", pa.string()), ("date", pa.date32()),
+            ("open", pa.float64()), ("high", pa.float64()), ("low", pa.float64()),
+            ("close", pa.float64()), ("volume", pa.int64()), ("full", pa.bool_()),
+        ])
+        if fmt == "parquet":
+            writer = pa.parquet.ParquetWriter(path, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(path, schema)
+        try:
+            for rows in chunks:
+                columns = list(zip(*rows))
+                columns[1] = np.array(columns[1], dtype="datetime64[D]")
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                    schema=schema,
+                ))
+                written += len(rows)
+        finally:
+            writer.close()
+    return written
+
+
+# Chunks of (symbol, date, open, high, low, close, volume, full) tuples read from an export
+def read_history(path, chunk_size=CHUNK_SIZE):
+    fmt = detect_format(path)
+
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            has_full = "full" in next(reader)
+            rows = []
+            for symbol, date, o, h, low, c, v, *full in reader:
+                rows.append((symbol, date, float(o), float(h), float(low), float(c), int(v),
+                             has_full and full[0] == "1"))
+                if len(rows) == chunk_size:
+                    yield rows
+                    rows = []
+            if rows:
+                yield rows
+
+    elif fmt == "npy":
+        data = np.load(path, mmap_mode="r")
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            full = chunk["full"].tolist() if "full" in data.dtype.names else [False] * len(chunk)
+            yield list(zip(
+                chunk["symbol"].tolist(), chunk["date"].astype(str).tolist(),
+                chunk["open"].tolist(), chunk["high"].tolist(), chunk["low"].tolist(),
+                chunk["close"].tolist(), chunk["volume"].tolist(), full,
+            ))
+
+    else:
+        pa = _pyarrow()
+        if fmt == "parquet":
+            batches = pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(path))
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        for batch in batches:
+            columns = [
+                batch.column(name).to_pylist() if name in batch.schema.names else [False] * batch.num_rows
+                for name in COLUMNS
+            ]
+            columns[1] = [date.isoformat() for date in columns[1]]
+            yield list(zip(*columns))
+
+
+# Seed the cache from an export; returns the number of rows loaded
+def import_history(path, cache=None, fresh=False, chunk_size=CHUNK_SIZE):
+    cache = cache or StockCache()
+    loaded = 0
+    for rows in read_history(path, chunk_size):
+        full = {row[0] for row in rows if row[-1]}
+        loaded += cache.insert_bars([row[:-1] for row in rows], fresh=fresh, full=full)
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import cached daily history.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="write cached history to a file")
+    export.add_argument("path", help="output file (.csv, .parquet, .arrow, .feather or .npy)")
+    export.add_argument("symbols", nargs="*", help="symbols to export (default: all cached)")
+    load = commands.add_parser("import", help="seed the cache from an exported file")
+    load.add_argument("path")
+    load.add_argument("--fresh", action="store_true", help="treat imported data as up to date")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        count = export_history(args.path, [s.upper() for s in args.symbols] or None)
+        print(f"Exported {count} bars to {args.path}")
+    else:
+        count = import_history(args.path, fresh=args.fresh)
+        print(f"Imported {count} bars from {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# Process-wide state shared by every session: when the app is served to a team (SERVER_MODE=1),
+# all browsers share one cache, provider and rate limiter, so N users watching AAPL cost one API call
+import asyncio
+import os
+import threading
+import time
+import traceback
+
+from cache import StockCache
+from config import SYMBOLS_PATH
+from history import HistoryLoader
+from live import LiveFeed
+from providers import make_provider
+from scheduler import RateLimiter
+from symbols import SymbolIndex, listing_rows
+
+
+# Seconds before a failed listing load (no file and no download) is tried again
+LISTING_RETRY_DELAY = 300
+
+# Minimal publish/subscribe: callbacks registered per topic, called with the published arguments.
+# Sessions subscribe from handler threads as well as the event loop, so the registry is locked.
+class Hub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, topic, callback):
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(callback)
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic)
+            if callbacks is not None:
+                callbacks.discard(callback)
+                if not callbacks:
+                    del self._subscribers[topic]
+
+    # Drop `callback` from every topic, e.g. when its session closes
+    def unsubscribe_all(self, callback):
+        with self._lock:
+            for topic in [topic for topic, callbacks in self._subscribers.items() if callback in callbacks]:
+                self._subscribers[topic].discard(callback)
+                if not self._subscribers[topic]:
+                    del self._subscribers[topic]
+
+    def subscribers(self, topic):
+        with self._lock:
+            return len(self._subscribers.get(topic, ()))
+
+    def publish(self, topic, *args):
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, ()))
+        for callback in callbacks:
+            # One broken session (e.g. closed mid-update) must not stop delivery to the others
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
+
+
+# Topics: ("bars", symbol) after new daily bars are stored, with (symbol);
+# ("live", symbol) after new live ticks, with (symbol, buffer, first_seq); ("live_error", symbol) with (symbol, error)
+class Backend:
+    def __init__(self, provider=None, cache=None, symbols_path=SYMBOLS_PATH):
+        self.symbols_path = symbols_path
+        self._symbols = None
+        self._symbols_started = 0
+        self.hub = Hub()
+        self.cache = cache or StockCache()
+        self.provider = provider or make_provider()
+        self.limiter = RateLimiter() if self.provider.rate_limited else None
+        self.loader = HistoryLoader(self.provider, self.cache, self.limiter, on_update=self._on_update)
+        self.live = LiveFeed(self.provider, self._on_live_ticks, self._on_live_error, limiter=self.limiter)
+
+    # Symbol index for autocomplete and validation, or None when no listing is available.
+    # Loaded (or downloaded) once per process; must be awaited on the event loop.
+    async def symbol_index(self):
+        task = self._symbols_task()
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            return None
+
+    # The index if it is already loaded, else None (and it starts loading), so lookups never wait on
+    # the listing download; must be called on the event loop
+    def ready_symbol_index(self):
+        task = self._symbols_task()
+        if not task.done() or task.cancelled() or task.exception() is not None:
+            return None
+        return task.result()
+
+    # The load in progress or done; one that came up empty is started again after LISTING_RETRY_DELAY,
+    # so a network blip doesn't turn autocomplete off until the app restarts
+    def _symbols_task(self):
+        task = self._symbols
+        failed = task is not None and task.done() and (
+            task.cancelled() or task.exception() is not None or task.result() is None
+        )
+        if task is None or (failed and time.monotonic() - self._symbols_started >= LISTING_RETRY_DELAY):
+            self._symbols = asyncio.ensure_future(self._load_symbols())
+            self._symbols_started = time.monotonic()
+        return self._symbols
+
+    async def _load_symbols(self):
+        if os.path.exists(self.symbols_path):
+            index = await asyncio.to_thread(SymbolIndex.load, self.symbols_path)
+            # A listing with no symbols at all is a bad download, so it is fetched again below
+            if len(index) or not self.symbols_path.endswith(".csv"):
+                return index
+        if not self.symbols_path.endswith(".csv"):
+            return None
+        # No local listing yet: fetch it once and keep it, it rarely changes
+        try:
+            if self.limiter is not None:
+                await self.limiter.acquire()
+            text = await self.provider.listing()
+        except Exception:
+            return None
+        if text is None:
+            return None
+        # Only a real listing is kept; anything else (e.g. an error or throttling message) is retried later
+        index = SymbolIndex(listing_rows(text), complete=True)
+        if not len(index):
+            return None
+        with open(self.symbols_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return index
+
+    def _on_update(self, symbol):
+        self.hub.publish(("bars", symbol), symbol)
+
+    def _on_live_ticks(self, symbol, buffer, first):
+        self.hub.publish(("live", symbol), symbol, buffer, first)
+
+    def _on_live_error(self, symbol, error):
+        self.hub.publish(("live_error", symbol), symbol, error)
+
+    # Live polling runs once per symbol however many sessions watch it; must be called on the event loop
+    def watch_live(self, symbol, on_ticks, on_error=None):
+        first_watcher = not self.hub.subscribers(("live", symbol))
+        self.hub.subscribe(("live", symbol), on_ticks)
+        if on_error is not None:
+            self.hub.subscribe(("live_error", symbol), on_error)
+        if first_watcher:
+            self.live.start(symbol)
+        else:
+            # Late joiners get what the buffer already holds
+            buffer = self.live.buffers.get(symbol)
+            if buffer is not None and buffer.count:
+                on_ticks(symbol, buffer, 0)
+
+    def unwatch_live(self, symbol, on_ticks, on_error=None):
+        self.hub.unsubscribe(("live", symbol), on_ticks)
+        if on_error is not None:
+            self.hub.unsubscribe(("live_error", symbol), on_error)
+        if not self.hub.subscribers(("live", symbol)):
+            self.live.stop(symbol)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+# The backend for this process, created by the first session
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = Backend()
+        return _backend
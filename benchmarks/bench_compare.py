@@ -0,0 +1,65 @@
+# Aligning and normalizing several symbols for the comparison chart: vectorized vs per-date dict lookups
+# Run from the project root: python -m benchmarks.bench_compare
+import time
+
+import numpy as np
+
+from benchmarks.common import random_walk
+from benchmarks.fixtures import trading_days
+from series import OHLCVSeries, align_closes, percent_returns
+
+
+HISTORY_BARS = 5000
+RANGE_BARS = 1825
+SYMBOL_COUNTS = (2, 5, 10, 25)
+REPEATS = 20
+
+
+# A full history with ~2% of its bars missing (holidays on other exchanges, gaps in the data)
+def history(seed):
+    rng = np.random.default_rng(seed)
+    dates = np.array(trading_days(HISTORY_BARS)[::-1], dtype="datetime64[D]")
+    keep = rng.random(HISTORY_BARS) > 0.02
+    closes = random_walk(HISTORY_BARS, seed)[keep]
+    return OHLCVSeries(dates[keep], closes, closes, closes, closes, np.zeros(len(closes), dtype=np.int64))
+
+
+# The straightforward version: a date -> close dict per symbol, walked one date at a time
+def align_dicts(series_list, start):
+    by_date = [dict(zip(series.dates.tolist(), series.close.tolist())) for series in series_list]
+    dates = sorted({date for closes in by_date for date in closes if date >= start})
+    lines = []
+    for closes in by_date:
+        line, last, base = [], None, None
+        for date in dates:
+            last = closes.get(date, last)
+            if last is not None and base is None:
+                base = last
+            line.append(None if last is None else (last / base - 1) * 100)
+        lines.append(line)
+    return dates, lines
+
+
+def measure(align):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        align()
+        timings.append(time.perf_counter() - started)
+    return np.median(timings) * 1000
+
+
+def main():
+    histories = [history(seed) for seed in range(max(SYMBOL_COUNTS))]
+    start = histories[0].dates[-RANGE_BARS]
+    print(f"{HISTORY_BARS} bars per symbol, last {RANGE_BARS} compared, median of {REPEATS} runs in ms\n")
+    print(f"{'symbols':>8}{'vectorized':>12}{'dicts':>10}")
+    for count in SYMBOL_COUNTS:
+        batch = histories[:count]
+        vectorized = measure(lambda: percent_returns(align_closes(batch, start)[1]))
+        dicts = measure(lambda: align_dicts(batch, start.item()))
+        print(f"{count:>8}{vectorized:>12.3f}{dicts:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
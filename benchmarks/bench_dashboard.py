@@ -0,0 +1,64 @@
+# Bytes sent and time spent per lookup: rebuilding the dashboard vs updating it in place
+# Run from the project root: python -m benchmarks.bench_dashboard
+import time
+
+import numpy as np
+
+from benchmarks.common import random_walk, serialize, update_payload
+from dashboard import Dashboard
+from downsample import downsample, point_budget
+from series import Bar
+
+
+CHART_WIDTH = 1400 - 2 * 30 - 2 * 25 - 10
+# A user flipping between symbols and ranges
+LOOKUPS = [(symbol, days) for symbol in ("AAPL", "MSFT", "NVDA") for days in (30, 90, 365, 1825, 7)]
+
+
+def show(dashboard, seed, days):
+    closes = random_walk(days, seed)
+    points = downsample(closes, point_budget(CHART_WIDTH))
+    latest = Bar("2025-01-02", closes[-1] * .99, closes[-1] * 1.01, closes[-1] * .98, float(closes[-1]), 1000)
+    change = float(closes[-1] - closes[-2])
+    dashboard.show_quote("SYM", latest, change, change / closes[-2] * 100)
+    dashboard.show_chart("Closing Price", points.tolist(), closes[points].tolist(), len(closes),
+                         float(closes.min()), float(closes.max()))
+
+
+def rebuild(seed, days):
+    dashboard = Dashboard()
+    show(dashboard, seed, days)
+    return len(serialize(dashboard.price_card)) + len(serialize(dashboard.chart_card))
+
+
+def in_place(dashboard, seed, days):
+    show(dashboard, seed, days)
+    size = update_payload(dashboard.price_card) + update_payload(dashboard.chart_card)
+    # Mark everything as sent for the next round
+    serialize(dashboard.price_card)
+    serialize(dashboard.chart_card)
+    return size
+
+
+def main():
+    persistent = Dashboard()
+    serialize(persistent.price_card)
+    serialize(persistent.chart_card)
+
+    results = {"rebuild": ([], []), "in place": ([], [])}
+    for seed, (symbol, days) in enumerate(LOOKUPS):
+        for name, run in (("rebuild", lambda: rebuild(seed, days)),
+                          ("in place", lambda: in_place(persistent, seed, days))):
+            start = time.perf_counter()
+            size = run()
+            results[name][0].append(size)
+            results[name][1].append((time.perf_counter() - start) * 1000)
+
+    print(f"{len(LOOKUPS)} lookups, chart width {CHART_WIDTH}px\n")
+    print(f"{'mode':<10}{'avg bytes':>12}{'max bytes':>12}{'avg ms':>9}")
+    for name, (sizes, timings) in results.items():
+        print(f"{name:<10}{np.mean(sizes):>12.0f}{np.max(sizes):>12}{np.mean(timings):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Chart payload size and build time with and without decimation
+# Run from the project root: python -m benchmarks.bench_downsample
+import time
+
+import flet as ft
+import numpy as np
+
+from benchmarks.common import random_walk, serialize
+from downsample import downsample, point_budget
+
+
+RANGES = {"1 week": 7, "2 weeks": 14, "30 days": 30, "90 days": 90, "1 year": 365, "5 years": 1825}
+CHART_WIDTH = 1400 - 2 * 30 - 2 * 25 - 10
+REPEATS = 20
+
+
+def build_chart(closes, points):
+    return ft.LineChart(
+        data_series=[
+            ft.LineChartData(
+                data_points=[
+                    ft.LineChartDataPoint(i, close)
+                    for i, close in zip(points.tolist(), closes[points].tolist())
+                ],
+                stroke_width=3,
+                curved=True,
+            ),
+        ],
+        min_y=float(closes.min()) * .95,
+        max_y=float(closes.max()) * 1.05,
+        min_x=0,
+        max_x=len(closes) - 1,
+    )
+
+
+def measure(closes, method):
+    budget = point_budget(CHART_WIDTH)
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        points = np.arange(len(closes)) if method == "raw" else downsample(closes, budget, method)
+        payload = serialize(build_chart(closes, points))
+        timings.append(time.perf_counter() - start)
+    return len(points), len(payload), np.median(timings) * 1000
+
+
+def main():
+    print(f"Chart width {CHART_WIDTH}px, budget {point_budget(CHART_WIDTH)} points, median of {REPEATS} runs\n")
+    print(f"{'range':<10}{'method':<8}{'points':>8}{'bytes':>10}{'ms':>9}")
+    for name, days in RANGES.items():
+        # The app shows `days` bars for each range
+        closes = random_walk(days)
+        for method in ("raw", "lttb", "minmax"):
+            n, size, ms = measure(closes, method)
+            print(f"{name:<10}{method:<8}{n:>8}{size:>10}{ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# End-to-end fetch -> parse -> render timings and startup time from recorded payloads, no network or API key needed
+# Run from the project root: python -m benchmarks.bench_pipeline [--fixtures DIR] [--latency 0.2]
+import argparse
+import asyncio
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+WORKDIR = tempfile.mkdtemp(prefix="stocks-bench-")
+RANGES = ("1 week", "2 weeks", "30 days", "90 days", "1 year", "5 years")
+WATCHLIST_SIZES = (1, 10, 50, 100, 250, 500)
+SESSION_COUNTS = (1, 10, 50)
+STARTUP_WATCHLIST = 50
+HISTORY_BARS = 2000
+WATCHLIST_BARS = 120
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", help="directory of recorded payloads (default: generate synthetic ones)")
+    parser.add_argument("--symbol", default="AAPL", help="symbol used for the single-symbol runs")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per request")
+    parser.add_argument("--repeats", type=int, default=20, help="lookups per range and cache state")
+    parser.add_argument("--sizes", type=int, nargs="+", default=WATCHLIST_SIZES, help="watchlist sizes")
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSION_COUNTS,
+                        help="concurrent sessions looking up the same symbol")
+    parser.add_argument("--launches", type=int, default=5, help="app launches per startup state")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# config reads the environment on import, so point it at the replay provider first
+fixtures = args.fixtures or os.path.join(WORKDIR, "fixtures")
+os.environ.update(
+    DATA_PROVIDER="replay",
+    REPLAY_DIR=fixtures,
+    REPLAY_LATENCY=str(args.latency),
+    CACHE_PATH=os.path.join(WORKDIR, "cache.db"),
+    SYMBOLS_PATH=os.path.join(WORKDIR, "listing_status.csv"),
+    PORTFOLIO_PATH=os.path.join(WORKDIR, "portfolio.json"),
+    ALERTS_PATH=os.path.join(WORKDIR, "alerts.json"),
+    # Only the startup runs restore a session, every other session here starts blank
+    SNAPSHOT_PATH="",
+)
+
+import flet as ft  # noqa: E402
+
+import app  # noqa: E402
+from backend import get_backend  # noqa: E402
+from benchmarks.common import HeadlessPage  # noqa: E402
+from benchmarks.fixtures import symbols, write_fixtures  # noqa: E402
+from cache import StockCache  # noqa: E402
+from history import HistoryLoader  # noqa: E402
+from metrics import STAGES, metrics  # noqa: E402
+from providers import ReplayProvider  # noqa: E402
+from scheduler import WatchlistScheduler  # noqa: E402
+from snapshot import save_snapshot  # noqa: E402
+
+
+def reset_cache():
+    StockCache().clear()
+
+
+# Drive the real UI: type the symbol, pick the range, submit
+async def lookup(page, symbol, time_range):
+    text_field = page.find(ft.TextField)[0]
+    dropdown = page.find(ft.Dropdown)[0]
+    text_field.value = symbol
+    dropdown.value = time_range
+    await asyncio.create_task(text_field.on_submit(None))
+
+
+async def bench_ranges(symbol):
+    print(f"Single symbol ({symbol}), {args.repeats} lookups per row, times in ms\n")
+    columns = [stage for stage in STAGES if stage != "total"]
+    print(f"{'range':<9}{'cache':<7}" + "".join(f"{c:>12}" for c in columns)
+          + f"{'total p50':>11}{'p95':>9}{'p99':>9}{'KB sent':>9}")
+    for time_range in RANGES:
+        for state in ("cold", "warm"):
+            # A fresh session per lookup, so nothing is kept in memory between them
+            pages = []
+            for _ in range(args.repeats):
+                page = HeadlessPage()
+                app.main(page)
+                if state == "warm":
+                    await lookup(page, symbol, time_range)
+                pages.append(page)
+
+            metrics.reset()
+            sent = []
+            for page in pages:
+                if state == "cold":
+                    reset_cache()
+                start = len(page.sent_bytes)
+                await lookup(page, symbol, time_range)
+                sent.append(sum(page.sent_bytes[start:]))
+                # Sessions left open would keep redrawing on every later download of the symbol
+                await page.on_close(None)
+            summary = metrics.summary()
+            cells = "".join(f"{summary[c]['p50'] if c in summary else 0:>12.2f}" for c in columns)
+            total = summary["total"]
+            print(f"{time_range:<9}{state:<7}{cells}{total['p50']:>11.2f}{total['p95']:>9.2f}"
+                  f"{total['p99']:>9.2f}{np.mean(sent) / 1024:>9.1f}")
+
+
+async def bench_watchlist(available):
+    print(f"\nWatchlist, cold cache, latency {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'symbols':>8}{'wall ms':>10}{'per sec':>10}{'row p50':>10}{'row p95':>10}{'row p99':>10}")
+    for size in args.sizes:
+        batch = available[:size]
+        reset_cache()
+        cache = StockCache()
+        loader = HistoryLoader(ReplayProvider(), cache)
+        arrived = {}
+        done = asyncio.Event()
+
+        def on_result(symbol, bars, error):
+            arrived[symbol] = time.perf_counter()
+            if len(arrived) == len(batch):
+                done.set()
+
+        scheduler = WatchlistScheduler(loader, on_result)
+        start = time.perf_counter()
+        for symbol in batch:
+            scheduler.submit(symbol)
+        scheduler.start()
+        await done.wait()
+        scheduler.stop()
+
+        wall = time.perf_counter() - start
+        rows = (np.array(list(arrived.values())) - start) * 1000
+        p50, p95, p99 = np.percentile(rows, [50, 95, 99])
+        print(f"{len(batch):>8}{wall * 1000:>10.1f}{len(batch) / wall:>10.1f}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+
+# Sessions opening the same symbol at once share the process-wide backend, so only one request goes out
+async def bench_sessions(symbol):
+    print(f"\nConcurrent sessions, {symbol} 5 years, cold cache, latency {args.latency * 1000:.0f} ms per request\n")
+    print(f"{'sessions':>8}{'requests':>10}{'wall ms':>10}{'total p50':>11}{'p95':>9}{'p99':>9}")
+    provider = get_backend().provider
+    request = provider._request
+    requests = []
+
+    async def counted(params):
+        requests.append(params)
+        return await request(params)
+
+    provider._request = counted
+    try:
+        for count in args.sessions:
+            reset_cache()
+            pages = []
+            for _ in range(count):
+                page = HeadlessPage()
+                app.main(page)
+                pages.append(page)
+            metrics.reset()
+            requests.clear()
+            start = time.perf_counter()
+            await asyncio.gather(*(lookup(page, symbol, "5 years") for page in pages))
+            wall = time.perf_counter() - start
+            for page in pages:
+                await page.on_close(None)
+            total = metrics.summary()["total"]
+            print(f"{count:>8}{len(requests):>10}{wall * 1000:>10.1f}{total['p50']:>11.2f}"
+                  f"{total['p95']:>9.2f}{total['p99']:>9.2f}")
+    finally:
+        provider._request = request
+
+
+# One app launch in a fresh interpreter: time to import the app, then to build the first frame
+STARTUP_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+from benchmarks.common import HeadlessPage
+
+async def first_frame():
+    page = HeadlessPage()
+    app.main(page)
+    return page
+
+page = asyncio.run(first_frame())
+print(json.dumps([imported - start, time.perf_counter() - imported, sum(page.sent_bytes)]))
+"""
+
+
+# Cold: no snapshot, so the first frame is an empty dashboard. Warm: the last session (a symbol on
+# 5 years, a compared symbol and a watchlist) is drawn from the cache before the first frame goes out.
+async def bench_startup(symbol, available):
+    print(f"\nStartup, median of {args.launches} launches, times in ms\n")
+    print(f"{'state':<7}{'import':>10}{'first frame':>13}{'total':>10}{'KB sent':>9}")
+    reset_cache()
+    loader = get_backend().loader
+    watchlist = available[:STARTUP_WATCHLIST]
+    await loader.load(symbol, 1825)
+    await asyncio.gather(*(loader.load(other, 30) for other in watchlist))
+    path = os.path.join(WORKDIR, "session.json")
+    save_snapshot({"symbol": symbol, "time_range": "5 years", "compare": watchlist[:1], "watchlist": watchlist}, path)
+
+    for state in ("cold", "warm"):
+        env = {**os.environ, "SNAPSHOT_PATH": path if state == "warm" else ""}
+        runs = []
+        for _ in range(args.launches):
+            output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], env=env, capture_output=True,
+                                    text=True, check=True).stdout
+            runs.append(json.loads(output.splitlines()[-1]))
+        imported, frame, sent = np.median(runs, axis=0)
+        print(f"{state:<7}{imported * 1000:>10.1f}{frame * 1000:>13.1f}{(imported + frame) * 1000:>10.1f}"
+              f"{sent / 1024:>9.1f}")
+
+
+async def main():
+    if args.fixtures:
+        available = sorted(os.path.basename(path)[len("TIME_SERIES_DAILY_"):-len(".json")]
+                           for path in glob.glob(os.path.join(fixtures, "TIME_SERIES_DAILY_*.json")))
+    else:
+        write_fixtures(fixtures, [args.symbol], HISTORY_BARS)
+        available = symbols(max(args.sizes))
+        write_fixtures(fixtures, available, WATCHLIST_BARS)
+    if args.symbol not in available and not os.path.exists(
+            os.path.join(fixtures, f"TIME_SERIES_DAILY_{args.symbol}.json")):
+        sys.exit(f"No recorded TIME_SERIES_DAILY payload for {args.symbol} in {fixtures}")
+
+    await bench_ranges(args.symbol)
+    await bench_sessions(args.symbol)
+    await bench_watchlist(available)
+    await bench_startup(args.symbol, available)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
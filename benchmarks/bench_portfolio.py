@@ -0,0 +1,87 @@
+# Portfolio valuation and alert checks: vectorized / indexed vs looping over every holding or rule
+# Run from the project root: python -m benchmarks.bench_portfolio
+import time
+
+import numpy as np
+
+from alerts import Alert, AlertEngine
+from benchmarks.fixtures import symbols
+from portfolio import Portfolio
+
+
+HOLDING_COUNTS = (10, 100, 500)
+RULE_COUNTS = (100, 1_000, 10_000, 100_000)
+SYMBOL_COUNT = 500
+BARS = 2_000
+REPEATS = 20
+
+
+# What Portfolio.value replaces: the app's per-symbol price change math, once per holding
+def value_loop(portfolio, latest):
+    total_value = total_cost = 0.0
+    for symbol, quantity, cost_basis in zip(portfolio.symbols, portfolio.quantity, portfolio.cost_basis):
+        if symbol not in latest:
+            continue
+        current_price, previous_price = latest[symbol]
+        price_change = current_price - previous_price
+        _ = (price_change / previous_price) * 100 if previous_price != 0 else 0
+        total_value += quantity * current_price
+        total_cost += quantity * cost_basis
+    return total_value - total_cost
+
+
+# What AlertEngine.update replaces: testing every rule against every new bar
+def scan(rules, last, symbol, price):
+    fired = []
+    previous = last.get(symbol)
+    for alert in rules:
+        if alert.symbol != symbol or previous is None:
+            continue
+        if alert.direction == "above" and previous < alert.threshold <= price:
+            fired.append(alert)
+        elif alert.direction == "below" and price <= alert.threshold < previous:
+            fired.append(alert)
+    last[symbol] = price
+    return fired
+
+
+def median_ms(run):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    names = symbols(SYMBOL_COUNT)
+
+    print(f"Valuation, median of {REPEATS} runs in ms\n")
+    print(f"{'holdings':>9}{'vectorized':>12}{'loop':>10}")
+    for count in HOLDING_COUNTS:
+        portfolio = Portfolio((name, rng.integers(1, 500), rng.uniform(10, 500)) for name in names[:count])
+        latest = {name: tuple(rng.uniform(10, 500, 2)) for name in names[:count]}
+        print(f"{count:>9}{median_ms(lambda: portfolio.value(latest)):>12.3f}"
+              f"{median_ms(lambda: value_loop(portfolio, latest)):>10.3f}")
+
+    print(f"\nAlerts, {BARS} bars across {SYMBOL_COUNT} symbols, microseconds per bar\n")
+    print(f"{'rules':>9}{'indexed':>12}{'scan':>10}")
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (SYMBOL_COUNT, BARS // SYMBOL_COUNT + 1)), axis=1))
+    bars = [(names[i % SYMBOL_COUNT], float(prices[i % SYMBOL_COUNT, i // SYMBOL_COUNT])) for i in range(BARS)]
+    for count in RULE_COUNTS:
+        rules = [
+            Alert(names[rng.integers(SYMBOL_COUNT)], "price", rng.choice(["above", "below"]), rng.uniform(50, 200))
+            for _ in range(count)
+        ]
+        engine = AlertEngine(rules)
+        last = {}
+        indexed = median_ms(lambda: [engine.update(symbol, price) for symbol, price in bars])
+        scanned = median_ms(lambda: [scan(rules, last, symbol, price) for symbol, price in bars]) if count <= 10_000 else None
+        scanned = f"{scanned * 1000 / BARS:>10.1f}" if scanned is not None else f"{'-':>10}"
+        print(f"{count:>9}{indexed * 1000 / BARS:>12.2f}{scanned}")
+
+
+if __name__ == "__main__":
+    main()
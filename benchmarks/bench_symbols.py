@@ -0,0 +1,58 @@
+# Autocomplete latency per keystroke over a listing the size of Alpha Vantage's (~12k symbols)
+# Run from the project root: python -m benchmarks.bench_symbols
+import string
+import time
+
+import numpy as np
+
+from symbols import SymbolIndex
+
+
+LISTING_SIZE = 12_000
+KEYSTROKES = 2_000
+
+
+def listing(n, seed=0):
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_uppercase))
+    rows = {}
+    while len(rows) < n:
+        symbol = "".join(rng.choice(letters, rng.integers(1, 6)))
+        rows[symbol] = (symbol, f"{symbol.title()} {rng.choice(['Inc', 'Corp', 'Holdings', 'Group'])}", "NASDAQ")
+    return list(rows.values())
+
+
+# What the index replaces: checking every listed symbol and name per keystroke
+def scan(rows, text, limit=8):
+    prefix, lower = text.upper(), text.lower()
+    return [row for row in rows if row[0].startswith(prefix) or row[1].lower().startswith(lower)][:limit]
+
+
+def measure(suggest, typed):
+    timings = []
+    for text in typed:
+        start = time.perf_counter()
+        suggest(text)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(np.array(timings) * 1e6, [50, 95, 99])
+
+
+def main():
+    rows = listing(LISTING_SIZE)
+    start = time.perf_counter()
+    index = SymbolIndex(rows)
+    build = (time.perf_counter() - start) * 1000
+
+    # Every prefix of random listed symbols, as typed one key at a time
+    rng = np.random.default_rng(1)
+    typed = [row[0][:i] for row in (rows[j] for j in rng.integers(0, len(rows), KEYSTROKES)) for i in (1, 2, 3)]
+
+    print(f"{len(index)} symbols, index built in {build:.1f} ms, {len(typed)} keystrokes, times in us\n")
+    print(f"{'method':<8}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, suggest in (("index", index.suggest), ("scan", lambda text: scan(rows, text))):
+        p50, p95, p99 = measure(suggest, typed)
+        print(f"{name:<8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
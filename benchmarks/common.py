@@ -0,0 +1,78 @@
+# Helpers shared by the benchmarks
+import asyncio
+import json
+
+import numpy as np
+from flet.core.protocol import CommandEncoder
+
+
+def random_walk(n, seed=42):
+    rng = np.random.default_rng(seed)
+    return 150 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+
+
+# What page.update() would put on the wire to add this control tree.
+# Building the add commands also marks every attribute as sent.
+def serialize(control):
+    return json.dumps(control._build_add_commands(), cls=CommandEncoder, separators=(",", ":"))
+
+
+# Every control in the tree, in layout order
+def walk(control):
+    stack = [control]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current._get_children()))
+
+
+# Approximate size of the update Flet sends after controls were changed in place:
+# only attributes modified since they were last sent go out, one "set" per control
+def update_payload(control):
+    size = 0
+    for current in walk(control):
+        dirty = {name: value for name, (value, is_dirty) in current._Control__attrs.items() if is_dirty}
+        if dirty:
+            size += len(json.dumps({"id": current.uid or "", "attrs": dirty}, separators=(",", ":")))
+    return size
+
+
+def mark_sent(control):
+    for current in walk(control):
+        attrs = current._Control__attrs
+        for name, (value, _) in list(attrs.items()):
+            attrs[name] = (value, False)
+
+
+# Just enough of ft.Page to run app.main() without a Flet client. update() does the diffing work
+# a real page would (finding and encoding changed attributes) and keeps the bytes it would send.
+class HeadlessPage:
+    def __init__(self, width=1400):
+        self.controls = []
+        self.overlay = []
+        self.width = width
+        self.window = type("Window", (), {"width": width, "height": 900})()
+        self.sent_bytes = []
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+        for control in controls:
+            self.sent_bytes.append(len(serialize(control)))
+
+    def update(self, *controls):
+        size = 0
+        for control in controls or self.controls:
+            size += update_payload(control)
+            mark_sent(control)
+        self.sent_bytes.append(size)
+
+    # Must be called with an event loop running, as Flet's own handlers are
+    def run_task(self, handler, *args):
+        return asyncio.ensure_future(handler(*args))
+
+    # Controls of a given type anywhere on the page, in layout order
+    def find(self, control_type):
+        found = []
+        for control in self.controls:
+            found.extend(c for c in walk(control) if isinstance(c, control_type))
+        return found
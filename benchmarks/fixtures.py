@@ -0,0 +1,52 @@
+# Synthetic Alpha Vantage payloads for ReplayProvider, so benchmarks run offline and deterministically
+import datetime
+import json
+import os
+
+import numpy as np
+
+
+# Business days ending at `end`, newest first
+def trading_days(n, end=None):
+    day = end or datetime.date.today()
+    days = []
+    while len(days) < n:
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day -= datetime.timedelta(days=1)
+    return days
+
+
+# A TIME_SERIES_DAILY payload with `bars` bars of a seeded random walk
+def daily_payload(symbol, bars, seed):
+    rng = np.random.default_rng(seed)
+    closes = 50 + 150 * np.exp(np.cumsum(rng.normal(0, 0.015, bars)))
+    spread = np.abs(rng.normal(0, 0.01, bars)) * closes
+    volumes = rng.integers(1_000_000, 50_000_000, bars)
+    series = {}
+    # Oldest bar first in the arrays, newest first in the payload (like the API)
+    for i, date in enumerate(trading_days(bars)):
+        j = bars - 1 - i
+        series[date] = {
+            "1. open": f"{closes[j - 1] if j else closes[j]:.4f}",
+            "2. high": f"{closes[j] + spread[j]:.4f}",
+            "3. low": f"{closes[j] - spread[j]:.4f}",
+            "4. close": f"{closes[j]:.4f}",
+            "5. volume": str(volumes[j]),
+        }
+    return {
+        "Meta Data": {"1. Information": "Daily Prices (open, high, low, close) and Volumes", "2. Symbol": symbol},
+        "Time Series (Daily)": series,
+    }
+
+
+def write_fixtures(directory, symbols, bars):
+    os.makedirs(directory, exist_ok=True)
+    for seed, symbol in enumerate(symbols):
+        with open(os.path.join(directory, f"TIME_SERIES_DAILY_{symbol}.json"), "w", encoding="utf-8") as f:
+            json.dump(daily_payload(symbol, bars, seed), f)
+
+
+# Made-up tickers: SYM000, SYM001, ...
+def symbols(n):
+    return [f"SYM{i:03d}" for i in range(n)]
@@ -0,0 +1,253 @@
+# Local on-disk cache for Alpha Vantage time series (SQLite)
+import sqlite3
+import threading
+import time
+
+from config import CACHE_PATH, CACHE_TTL, CACHE_MAX_BARS, CACHE_MAX_IDLE
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    symbol TEXT NOT NULL,
+    function TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    has_full INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, function)
+);
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    function TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL NOT NULL,
+    high REAL NOT NULL,
+    low REAL NOT NULL,
+    close REAL NOT NULL,
+    volume INTEGER NOT NULL,
+    PRIMARY KEY (symbol, function, date)
+) WITHOUT ROWID;
+"""
+
+
+class StockCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bars=CACHE_MAX_BARS, max_idle=CACHE_MAX_IDLE):
+        self.path = path
+        self.ttl = ttl
+        self.max_bars = max_bars
+        self.max_idle = max_idle
+        # Flet runs sync handlers on worker threads, so serialize writes
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Caches created before full history tracking
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(series)")]
+            if "has_full" not in columns:
+                conn.execute("ALTER TABLE series ADD COLUMN has_full INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    # When the series was last downloaded (epoch seconds), or None if it isn't cached
+    def fetched_at(self, symbol, function="TIME_SERIES_DAILY"):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM series WHERE symbol = ? AND function = ?",
+                (symbol, function),
+            ).fetchone()
+        return row[0] if row else None
+
+    # True when the cached series is younger than the TTL
+    def is_fresh(self, symbol, function="TIME_SERIES_DAILY"):
+        fetched_at = self.fetched_at(symbol, function)
+        return fetched_at is not None and time.time() - fetched_at < self.ttl
+
+    # True once the complete history (outputsize=full) has been stored
+    def has_full(self, symbol, function="TIME_SERIES_DAILY"):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT has_full FROM series WHERE symbol = ? AND function = ?",
+                (symbol, function),
+            ).fetchone()
+        return bool(row and row[0])
+
+    # Symbols whose complete history is stored
+    def full_symbols(self, function="TIME_SERIES_DAILY"):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT symbol FROM series WHERE function = ? AND has_full", (function,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def last_date(self, symbol, function="TIME_SERIES_DAILY"):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(date) FROM bars WHERE symbol = ? AND function = ?",
+                (symbol, function),
+            ).fetchone()
+        return row[0] if row else None
+
+    # Rows (date, open, high, low, close, volume) oldest first, or None on a miss
+    def get(self, symbol, function="TIME_SERIES_DAILY", days=None):
+        with self._lock, self._connect() as conn:
+            touched = conn.execute(
+                "UPDATE series SET accessed_at = ? WHERE symbol = ? AND function = ?",
+                (time.time(), symbol, function),
+            ).rowcount
+            if not touched:
+                return None
+            query = ("SELECT date, open, high, low, close, volume FROM bars "
+                     "WHERE symbol = ? AND function = ? ORDER BY date DESC")
+            params = (symbol, function)
+            if days is not None:
+                query += " LIMIT ?"
+                params += (days,)
+            rows = conn.execute(query, params).fetchall()
+        rows.reverse()
+        return rows
+
+    # Store an Alpha Vantage "Time Series" payload, keeping only bars newer than what we already have.
+    # `full` marks a complete history download, which is written as a whole.
+    def merge(self, symbol, time_series, function="TIME_SERIES_DAILY", full=False):
+        last = self.last_date(symbol, function)
+        # A partial payload that doesn't reach back to our last bar would leave a hole, so start over
+        reset = not full and last is not None and bool(time_series) and min(time_series) > last
+        if full or reset:
+            last = None
+        rows = [
+            (
+                symbol, function, date,
+                float(bar["1. open"]), float(bar["2. high"]),
+                float(bar["3. low"]), float(bar["4. close"]),
+                int(float(bar.get("5. volume", 0))),
+            )
+            for date, bar in time_series.items()
+            # The last cached bar is rewritten since it may have been an intraday snapshot
+            if last is None or date >= last
+        ]
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            if reset:
+                self._delete(conn, symbol, function)
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT INTO series VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (symbol, function) DO UPDATE SET "
+                "fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at, "
+                "has_full = MAX(has_full, excluded.has_full)",
+                (symbol, function, now, now, int(full)),
+            )
+        self.evict()
+        return len(rows)
+
+    # Drop series idle for too long, then least recently used ones until under the bar budget
+    def evict(self):
+        with self._lock, self._connect() as conn:
+            idle = conn.execute(
+                "SELECT symbol, function FROM series WHERE accessed_at < ?",
+                (time.time() - self.max_idle,),
+            ).fetchall()
+            for key in idle:
+                self._delete(conn, *key)
+
+            total = conn.execute("SELECT COUNT(*) FROM bars").fetchone()[0]
+            if total <= self.max_bars:
+                return
+            lru = conn.execute(
+                "SELECT s.symbol, s.function, COUNT(b.date) FROM series s "
+                "LEFT JOIN bars b ON b.symbol = s.symbol AND b.function = s.function "
+                "GROUP BY s.symbol, s.function ORDER BY s.accessed_at ASC"
+            ).fetchall()
+            # Never evict the most recently used series, even if it alone exceeds the budget
+            for symbol, function, count in lru[:-1]:
+                if total <= self.max_bars:
+                    break
+                self._delete(conn, symbol, function)
+                total -= count
+
+    # {symbol: (close, previous close)} for many symbols in one query; a symbol with a single bar
+    # uses it for both, symbols with no bars are left out
+    def latest_closes(self, symbols, function="TIME_SERIES_DAILY"):
+        # No symbols means none here, not every symbol as in iter_bars (which would rank the whole table)
+        if not symbols:
+            return {}
+        query, params = self._bars_filter(symbols, function)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT symbol, close FROM ("
+                "SELECT symbol, close, ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS n "
+                "FROM bars" + query + ") WHERE n <= 2 ORDER BY symbol, n",
+                params,
+            ).fetchall()
+        latest = {}
+        for symbol, close in rows:
+            latest[symbol] = (latest[symbol][0], close) if symbol in latest else (close, close)
+        return latest
+
+    def symbols(self, function="TIME_SERIES_DAILY"):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT symbol FROM series WHERE function = ? ORDER BY symbol", (function,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self, symbols=None, function="TIME_SERIES_DAILY"):
+        query, params = self._bars_filter(symbols, function)
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM bars" + query, params).fetchone()[0]
+
+    # Stream (symbol, date, open, high, low, close, volume) rows ordered by symbol and date,
+    # `chunk_size` at a time, without loading everything into memory
+    def iter_bars(self, symbols=None, function="TIME_SERIES_DAILY", chunk_size=50_000):
+        query, params = self._bars_filter(symbols, function)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "SELECT symbol, date, open, high, low, close, volume FROM bars" + query
+                + " ORDER BY symbol, date", params
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+
+    def _bars_filter(self, symbols, function):
+        query, params = " WHERE function = ?", [function]
+        if symbols:
+            query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+            params += list(symbols)
+        return query, params
+
+    # Bulk load rows in iter_bars' format (e.g. from an export). Imported series are marked stale so the
+    # next lookup fetches a small delta, unless `fresh`; `full` names the symbols whose complete history
+    # the rows come from (as recorded by the export, since a bar count can't tell).
+    def insert_bars(self, rows, function="TIME_SERIES_DAILY", fresh=False, full=()):
+        now = time.time()
+        fetched_at = now if fresh else 0
+        symbols = dict.fromkeys(row[0] for row in rows)
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((symbol, function, *bar) for symbol, *bar in rows),
+            )
+            for symbol in symbols:
+                has_full = int(symbol in full)
+                conn.execute(
+                    "INSERT INTO series VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (symbol, function) DO UPDATE SET "
+                    "fetched_at = MAX(fetched_at, excluded.fetched_at), accessed_at = excluded.accessed_at, "
+                    "has_full = MAX(has_full, excluded.has_full)",
+                    (symbol, function, fetched_at, now, has_full),
+                )
+        return len(rows)
+
+    def _delete(self, conn, symbol, function):
+        conn.execute("DELETE FROM bars WHERE symbol = ? AND function = ?", (symbol, function))
+        conn.execute("DELETE FROM series WHERE symbol = ? AND function = ?", (symbol, function))
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM bars")
+            conn.execute("DELETE FROM series")
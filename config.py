@@ -4,8 +4,65 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-# Alpha Vantage API Key
+# Alpha Vantage API Key (only needed by the alphavantage provider, checked on first request)
 API_KEY = os.getenv('API_KEY')
 
-if not API_KEY:
-    raise ValueError("API_KEY not found in .env file")
+# Market data source: "alphavantage", or "replay" to serve recorded payloads offline
+DATA_PROVIDER = os.getenv('DATA_PROVIDER', 'alphavantage')
+REPLAY_DIR = os.getenv('REPLAY_DIR', 'fixtures')
+REPLAY_LATENCY = float(os.getenv('REPLAY_LATENCY', 0))  # seconds added to every replayed request
+RECORD_DIR = os.getenv('RECORD_DIR')  # save every Alpha Vantage payload here for replay
+
+# Local time series cache
+CACHE_PATH = os.getenv('CACHE_PATH', 'stock_cache.db')
+CACHE_TTL = int(os.getenv('CACHE_TTL', 6 * 60 * 60))  # refetch after 6 hours
+CACHE_MAX_IDLE = int(os.getenv('CACHE_MAX_IDLE', 30 * 24 * 60 * 60))  # evict after 30 days unused
+CACHE_MAX_BARS = int(os.getenv('CACHE_MAX_BARS', 500_000))  # total bars kept on disk
+
+# Seconds before an API request is abandoned
+FETCH_TIMEOUT = float(os.getenv('FETCH_TIMEOUT', 15))
+
+# Alpha Vantage quota (free tier) and watchlist concurrency
+CALLS_PER_MINUTE = int(os.getenv('CALLS_PER_MINUTE', 5))
+CALLS_PER_DAY = int(os.getenv('CALLS_PER_DAY', 25))
+MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', 10))
+
+# Retries for throttled or dropped requests: attempts in total, first delay and longest delay (seconds)
+RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 4))
+RETRY_DELAY = float(os.getenv('RETRY_DELAY', 5))
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 60))
+WATCHLIST_WORKERS = int(os.getenv('WATCHLIST_WORKERS', 4))
+
+# Chart decimation: pixels per plotted point, and "lttb" or "minmax"
+CHART_PX_PER_POINT = float(os.getenv('CHART_PX_PER_POINT', 3))
+DOWNSAMPLE_METHOD = os.getenv('DOWNSAMPLE_METHOD', 'lttb')
+
+# Bars returned by TIME_SERIES_DAILY with outputsize=compact
+COMPACT_BARS = 100
+
+# Live mode: seconds between quote polls, and ticks kept per symbol
+LIVE_INTERVAL = float(os.getenv('LIVE_INTERVAL', 60))
+LIVE_CAPACITY = int(os.getenv('LIVE_CAPACITY', 390))  # one trading day of minutes
+
+# Timing metrics: samples kept per stage, on-screen stats, and a JSON file refreshed after every lookup
+METRICS_WINDOW = int(os.getenv('METRICS_WINDOW', 1000))
+SHOW_STATS = os.getenv('SHOW_STATS', '').lower() in ('1', 'true', 'yes')
+METRICS_EXPORT = os.getenv('METRICS_EXPORT')
+
+# Symbol autocomplete: listing file (LISTING_STATUS .csv, downloaded once if missing, or a saved
+# SYMBOL_SEARCH .json), and seconds of typing pause before suggestions update
+SYMBOLS_PATH = os.getenv('SYMBOLS_PATH', 'listing_status.csv')
+SUGGEST_DEBOUNCE = float(os.getenv('SUGGEST_DEBOUNCE', 0.15))
+
+# Web deployment: serve the app to browsers on this port, with one shared cache and fetch queue
+SERVER_MODE = os.getenv('SERVER_MODE', '').lower() in ('1', 'true', 'yes')
+SERVER_PORT = int(os.getenv('SERVER_PORT', 8550))
+
+# Holdings and price alerts, kept as JSON files ('' keeps them for the session only). Off by default
+# in SERVER_MODE, where every session would load and overwrite the same files
+PORTFOLIO_PATH = os.getenv('PORTFOLIO_PATH', '' if SERVER_MODE else 'portfolio.json')
+ALERTS_PATH = os.getenv('ALERTS_PATH', '' if SERVER_MODE else 'alerts.json')
+
+# Last session's symbol, range, compared symbols and watchlist, restored at startup ('' turns it off).
+# Off by default in SERVER_MODE, where sessions belong to different people
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', '' if SERVER_MODE else 'session.json')
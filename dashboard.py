@@ -0,0 +1,407 @@
+# Price info and chart cards, built once and then updated in place so Flet only sends what changed
+import flet as ft
+
+
+def card_shadow(opacity=0.1, blur=20, offset=4):
+    return ft.BoxShadow(
+        spread_radius=0,
+        blur_radius=blur,
+        color=ft.Colors.with_opacity(opacity, ft.Colors.BLACK),
+        offset=ft.Offset(0, offset)
+    )
+
+
+# Colors for indicator output lines, by output name
+LINE_COLORS = {
+    "sma": ft.Colors.ORANGE_600,
+    "ema": ft.Colors.PINK_400,
+    "middle": ft.Colors.TEAL_400,
+    "upper": ft.Colors.TEAL_200,
+    "lower": ft.Colors.TEAL_200,
+    "rsi": ft.Colors.DEEP_PURPLE_400,
+    "macd": ft.Colors.BLUE_600,
+    "signal": ft.Colors.ORANGE_600,
+}
+
+
+# Colors for compared symbols, by position in the comparison
+COMPARE_COLORS = [
+    ft.Colors.ORANGE_600, ft.Colors.GREEN_600, ft.Colors.RED_600, ft.Colors.PURPLE_600, ft.Colors.TEAL_600,
+    ft.Colors.PINK_400, ft.Colors.BROWN_400, ft.Colors.INDIGO_400, ft.Colors.LIME_700, ft.Colors.CYAN_700,
+]
+
+
+def indicator_line(output, color=None):
+    return ft.LineChartData(
+        data_points=[],
+        stroke_width=2,
+        color=color or LINE_COLORS.get(output, ft.Colors.GREY_600),
+        curved=True,
+    )
+
+
+# "just now", "12 min ago", "3 h ago", "2 days ago"
+def format_age(seconds):
+    if seconds < 60:
+        return "just now"
+    if seconds < 60 * 60:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 24 * 60 * 60:
+        return f"{int(seconds // 3600)} h ago"
+    days = int(seconds // 86400)
+    return f"{days} day{'s' if days > 1 else ''} ago"
+
+
+# One of the Open / High / Low / Close cards; returns the card and its value text
+def price_card(label, icon, color, bgcolor, text_color, value_color):
+    value = ft.Text("", size=24, weight=ft.FontWeight.BOLD, color=value_color)
+    card = ft.Container(
+        content=ft.Column([
+            ft.Row([
+                ft.Icon(icon, color=color, size=16),
+                ft.Text(label, size=13, color=text_color, weight=ft.FontWeight.W_500)
+            ], spacing=5),
+            value,
+        ], spacing=8),
+        padding=20,
+        bgcolor=bgcolor,
+        border_radius=12,
+        expand=True,
+        shadow=card_shadow(0.08, 10, 2)
+    )
+    return card, value
+
+
+class Dashboard:
+    # overlays / oscillators: indicator labels offered as checkboxes under the chart title.
+    # on_compare is called when symbols to compare against are submitted.
+    def __init__(self, overlays=(), oscillators=(), on_indicator_change=None, on_compare=None):
+        # Stock header
+        self.symbol = ft.Text("", color=ft.Colors.GREY_900, size=32, weight=ft.FontWeight.BOLD)
+        self.as_of = ft.Text("", color=ft.Colors.GREY_600, size=14)
+        self.freshness = ft.Text("", color=ft.Colors.GREY_500, size=12)
+        self.price = ft.Text("", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900)
+        self.change_icon = ft.Icon(ft.Icons.ARROW_UPWARD, size=16, color=ft.Colors.GREEN_600)
+        self.change = ft.Text("", size=16, weight=ft.FontWeight.W_500, color=ft.Colors.GREEN_600)
+
+        # Price cards
+        open_card, self.open = price_card("Open", ft.Icons.PLAY_ARROW, ft.Colors.BLUE_700,
+                                          ft.Colors.BLUE_50, ft.Colors.BLUE_800, ft.Colors.BLUE_900)
+        high_card, self.high = price_card("High", ft.Icons.TRENDING_UP, ft.Colors.GREEN_700,
+                                          ft.Colors.GREEN_50, ft.Colors.GREEN_800, ft.Colors.GREEN_900)
+        low_card, self.low = price_card("Low", ft.Icons.TRENDING_DOWN, ft.Colors.RED_700,
+                                        ft.Colors.RED_50, ft.Colors.RED_800, ft.Colors.RED_900)
+        close_card, self.close = price_card("Close", ft.Icons.STOP_CIRCLE_OUTLINED, ft.Colors.PURPLE_700,
+                                            ft.Colors.PURPLE_50, ft.Colors.PURPLE_800, ft.Colors.PURPLE_900)
+
+        self.price_card = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Column([self.symbol, self.as_of, self.freshness], spacing=5),
+                    ft.Container(expand=True),
+                    ft.Container(
+                        content=ft.Column([
+                            self.price,
+                            ft.Row([self.change_icon, self.change], spacing=5)
+                        ], horizontal_alignment=ft.CrossAxisAlignment.END, spacing=5)
+                    )
+                ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+
+                ft.Divider(height=1, color=ft.Colors.GREY_300),
+
+                ft.Row([open_card, high_card, low_card, close_card], spacing=15)
+            ], spacing=20),
+            padding=25,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=15,
+            shadow=card_shadow()
+        )
+
+        # Closing price chart; its points are recycled between updates
+        self.closes = ft.LineChartData(
+            data_points=[],
+            stroke_width=3,
+            color=ft.Colors.BLUE_700,
+            curved=True,
+            stroke_cap_round=True,
+            below_line_bgcolor=ft.Colors.with_opacity(0.1, ft.Colors.BLUE_700),
+        )
+        self.chart = ft.LineChart(
+            data_series=[self.closes],
+            border=ft.Border(
+                bottom=ft.BorderSide(2, ft.Colors.GREY_300),
+                left=ft.BorderSide(2, ft.Colors.GREY_300),
+            ),
+            left_axis=ft.ChartAxis(
+                labels_size=50,
+            ),
+            bottom_axis=ft.ChartAxis(
+                labels_size=40,
+                labels_interval=1,
+            ),
+            tooltip_bgcolor=ft.Colors.with_opacity(.9, ft.Colors.GREY_900),
+            min_x=0,
+            expand=True
+        )
+        self.chart_title = ft.Text("", size=20, weight=ft.FontWeight.BOLD, color=ft.Colors.GREY_900)
+
+        # Indicator toggles; overlay lines share the price chart, each oscillator gets a small chart of its own
+        self.indicator_toggles = {
+            label: ft.Checkbox(label=label, value=False, on_change=on_indicator_change)
+            for label in (*overlays, *oscillators)
+        }
+        self.indicator_lines = {}
+
+        # Symbols to compare against; the chart then shows percent returns with a legend
+        self.compare_input = ft.TextField(
+            label="Compare with",
+            hint_text="MSFT, NVDA",
+            width=220,
+            dense=True,
+            on_submit=on_compare,
+            border_radius=10,
+            border_color=ft.Colors.GREY_300,
+            focused_border_color=ft.Colors.BLUE_700,
+        )
+        self.compare_legend = ft.Row([], spacing=15, wrap=True, visible=False)
+
+        self.oscillators = {}
+        for label in oscillators:
+            chart = ft.LineChart(
+                data_series=[],
+                border=ft.Border(
+                    bottom=ft.BorderSide(1, ft.Colors.GREY_300),
+                    left=ft.BorderSide(1, ft.Colors.GREY_300),
+                ),
+                left_axis=ft.ChartAxis(labels_size=50),
+                tooltip_bgcolor=ft.Colors.with_opacity(.9, ft.Colors.GREY_900),
+                min_x=0,
+                expand=True
+            )
+            panel = ft.Container(
+                content=ft.Column([
+                    ft.Text(label, size=14, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_700),
+                    ft.Container(content=chart, expand=True),
+                ], spacing=5),
+                padding=ft.padding.only(right=10),
+                height=150,
+                visible=False
+            )
+            self.oscillators[label] = (panel, chart)
+
+        # Live ticks, a sliding window appended to as quotes arrive
+        self.live_title = ft.Text("", size=14, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_700)
+        self.live_ticks = ft.LineChartData(
+            data_points=[],
+            stroke_width=2,
+            color=ft.Colors.GREEN_700,
+            below_line_bgcolor=ft.Colors.with_opacity(0.08, ft.Colors.GREEN_700),
+        )
+        self.live_chart = ft.LineChart(
+            data_series=[self.live_ticks],
+            border=ft.Border(
+                bottom=ft.BorderSide(1, ft.Colors.GREY_300),
+                left=ft.BorderSide(1, ft.Colors.GREY_300),
+            ),
+            left_axis=ft.ChartAxis(labels_size=50),
+            tooltip_bgcolor=ft.Colors.with_opacity(.9, ft.Colors.GREY_900),
+            expand=True
+        )
+        self.live_panel = ft.Container(
+            content=ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.CIRCLE, color=ft.Colors.GREEN_600, size=10),
+                    self.live_title,
+                ], spacing=8),
+                ft.Container(content=self.live_chart, expand=True),
+            ], spacing=5),
+            padding=ft.padding.only(right=10),
+            height=180,
+            visible=False
+        )
+
+        self.chart_body = ft.Column([
+            ft.Row([
+                ft.Icon(ft.Icons.SHOW_CHART, color=ft.Colors.BLUE_700, size=24),
+                self.chart_title,
+            ], spacing=10),
+            ft.Row([
+                ft.Row(list(self.indicator_toggles.values()), spacing=15, wrap=True, expand=True),
+                self.compare_input,
+            ]),
+            self.compare_legend,
+            ft.Container(
+                content=self.chart,
+                padding=ft.padding.only(top=20, right=10, bottom=10, left=0),
+                height=350
+            ),
+            *(panel for panel, _ in self.oscillators.values()),
+            self.live_panel,
+        ], spacing=15)
+
+        # Loading state with spinner, shown in place of the chart
+        self.loading = ft.Container(
+            content=ft.Column([
+                ft.ProgressRing(width=50, height=50, color=ft.Colors.BLUE_700),
+                ft.Text("Loading Stock Data...", color=ft.Colors.BLUE_700, size=16, weight=ft.FontWeight.W_500)
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER, spacing=15),
+            padding=40,
+            alignment=ft.alignment.center,
+            visible=False
+        )
+
+        self.chart_card = ft.Container(
+            content=ft.Column([self.loading, self.chart_body]),
+            padding=25,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=15,
+            shadow=card_shadow()
+        )
+
+    def show_loading(self, loading):
+        self.loading.visible = loading
+        self.chart_body.visible = not loading
+        # The spinner sits on the bare page, like before the chart card existed
+        self.chart_card.bgcolor = None if loading else ft.Colors.WHITE
+        self.chart_card.shadow = None if loading else card_shadow()
+
+    def show_quote(self, symbol, latest, price_change, price_change_percent):
+        is_positive = price_change >= 0
+        color = ft.Colors.GREEN_600 if is_positive else ft.Colors.RED_600
+        self.symbol.value = symbol
+        self.as_of.value = f"As of {latest.date}"
+        self.price.value = f"${latest.close:.2f}"
+        self.change_icon.name = ft.Icons.ARROW_UPWARD if is_positive else ft.Icons.ARROW_DOWNWARD
+        self.change_icon.color = color
+        self.change.value = f"${abs(price_change):.2f} ({abs(price_change_percent):.2f}%)"
+        self.change.color = color
+        self.open.value = f"${latest.open:.2f}"
+        self.high.value = f"${latest.high:.2f}"
+        self.low.value = f"${latest.low:.2f}"
+        self.close.value = f"${latest.close:.2f}"
+
+    # When the data on screen was downloaded; stale or possibly outdated data is shown in amber
+    def show_freshness(self, text, stale=False):
+        self.freshness.value = text
+        self.freshness.color = ft.Colors.AMBER_800 if stale else ft.Colors.GREY_500
+
+    def selected_indicators(self):
+        return [label for label, toggle in self.indicator_toggles.items() if toggle.value]
+
+    # xs / ys are the (already decimated) points, n the undecimated length of the range.
+    # overlays are (label, output, xs, ys) lines drawn over the closes.
+    def show_chart(self, title, xs, ys, n, min_y, max_y, overlays=()):
+        self.chart_title.value = title
+        self.compare_legend.visible = False
+        set_points(self.closes, xs, ys)
+        lines = self._set_lines(overlays)
+        self.chart.data_series = [self.closes, *lines]
+        for _, _, _, line_ys in overlays:
+            if len(line_ys):
+                min_y = min(min_y, min(line_ys))
+                max_y = max(max_y, max(line_ys))
+        self.chart.min_y = min_y * .95
+        self.chart.max_y = max_y * 1.05
+        self.chart.max_x = n - 1
+        self.chart.bottom_axis.labels_interval = max(1, n // 10)
+
+    # lines are (symbol, xs, ys, label) of percent returns sharing one x axis, the symbol on screen first;
+    # ys may not cover every x (a symbol listed after the range start)
+    def show_comparison(self, title, lines, n):
+        self.chart_title.value = title
+        series, legend = [], []
+        values = []
+        for i, (symbol, xs, ys, label) in enumerate(lines):
+            if i == 0:
+                data, color = self.closes, self.closes.color
+            else:
+                color = COMPARE_COLORS[(i - 1) % len(COMPARE_COLORS)]
+                key = ("compare", i)
+                if key not in self.indicator_lines:
+                    self.indicator_lines[key] = indicator_line(None, color)
+                data = self.indicator_lines[key]
+            set_points(data, xs, ys)
+            series.append(data)
+            values.extend(ys)
+            legend.append(ft.Row([
+                ft.Icon(ft.Icons.CIRCLE, color=color, size=10),
+                ft.Text(f"{symbol} {label}", size=13, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_800),
+            ], spacing=5))
+        self.chart.data_series = series
+        self.compare_legend.controls = legend
+        self.compare_legend.visible = True
+        if values:
+            low, high = min(values), max(values)
+            pad = (high - low) * .05 or 1
+            self.chart.min_y = low - pad
+            self.chart.max_y = high + pad
+        self.chart.max_x = max(1, n - 1)
+        self.chart.bottom_axis.labels_interval = max(1, n // 10)
+
+    # lines for one oscillator, in the same form as show_chart's overlays; None hides it
+    def show_oscillator(self, label, lines, n):
+        panel, chart = self.oscillators[label]
+        panel.visible = lines is not None
+        if lines is None:
+            return
+        chart.data_series = self._set_lines(lines)
+        values = [y for _, _, _, line_ys in lines for y in line_ys]
+        if values:
+            low, high = min(values), max(values)
+            pad = (high - low) * .05 or 1
+            chart.min_y = low - pad
+            chart.max_y = high + pad
+        chart.max_x = max(1, n - 1)
+
+    # symbol to start showing live ticks for, None to hide the panel
+    def show_live(self, symbol):
+        self.live_panel.visible = symbol is not None
+        self.live_title.value = f"Live - {symbol}" if symbol else ""
+        self.live_ticks.data_points.clear()
+
+    # Append new ticks (x = tick number) and drop the ones that fell out of the window,
+    # so each update only sends the points that changed
+    def append_live(self, xs, ys, capacity, min_y, max_y):
+        points = self.live_ticks.data_points
+        points.extend(ft.LineChartDataPoint(x, y) for x, y in zip(xs, ys))
+        if len(points) > capacity:
+            del points[:len(points) - capacity]
+        if points:
+            self.live_chart.min_x = points[0].x
+            self.live_chart.max_x = max(points[-1].x, points[0].x + 1)
+            pad = (max_y - min_y) * .1 or max_y * .001 or 1
+            self.live_chart.min_y = min_y - pad
+            self.live_chart.max_y = max_y + pad
+
+    def show_live_price(self, price, price_change, price_change_percent):
+        is_positive = price_change >= 0
+        color = ft.Colors.GREEN_600 if is_positive else ft.Colors.RED_600
+        self.price.value = f"${price:.2f}"
+        self.change_icon.name = ft.Icons.ARROW_UPWARD if is_positive else ft.Icons.ARROW_DOWNWARD
+        self.change_icon.color = color
+        self.change.value = f"${abs(price_change):.2f} ({abs(price_change_percent):.2f}%)"
+        self.change.color = color
+
+    # Reuse each line's LineChartData (and its points) across updates
+    def _set_lines(self, lines):
+        series = []
+        for label, output, xs, ys in lines:
+            key = (label, output)
+            if key not in self.indicator_lines:
+                self.indicator_lines[key] = indicator_line(output)
+            set_points(self.indicator_lines[key], xs, ys)
+            series.append(self.indicator_lines[key])
+        return series
+
+
+# Move existing points instead of replacing them, so an update is a set of x/y changes
+# rather than removing and re-adding every point
+def set_points(data, xs, ys):
+    points = data.data_points
+    if len(points) > len(xs):
+        del points[len(xs):]
+    for point, x, y in zip(points, xs, ys):
+        point.x = x
+        point.y = y
+    for x, y in zip(xs[len(points):], ys[len(points):]):
+        points.append(ft.LineChartDataPoint(x, y))
@@ -0,0 +1,61 @@
+# Shape-preserving decimation of long series before they are sent to the chart
+import numpy as np
+
+from config import CHART_PX_PER_POINT, DOWNSAMPLE_METHOD
+
+
+# How many points are worth drawing on a chart `width` pixels wide
+def point_budget(width, px_per_point=CHART_PX_PER_POINT):
+    return max(3, int(width // px_per_point))
+
+
+# Largest-Triangle-Three-Buckets: keeps the first and last point, then from each bucket
+# picks the point forming the largest triangle with the previous pick and the next bucket's mean
+def lttb(y, n_out):
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(n, dtype=np.float64)
+    # n_out - 2 buckets spanning everything between the first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+# Keeps the lowest and highest point of each bucket, so spikes are never dropped
+def minmax(y, n_out):
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    picked = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        picked.append(start + int(bucket.argmin()))
+        picked.append(start + int(bucket.argmax()))
+    # A flat bucket yields the same index twice
+    return np.unique(picked)
+
+
+METHODS = {"lttb": lttb, "minmax": minmax}
+
+
+# Indices of the points to draw, in order
+def downsample(y, n_out, method=DOWNSAMPLE_METHOD):
+    return METHODS[method](y, n_out)
@@ -0,0 +1,109 @@
+# Alpha Vantage provider: async httpx client with timeouts and a shared connection pool
+import json
+import os
+
+from config import API_KEY, FETCH_TIMEOUT, MAX_CONNECTIONS, RECORD_DIR
+from metrics import metrics
+from providers import MarketDataProvider, ProviderError, fixture_name, payload_error
+
+
+BASE_URL = "https://www.alphavantage.co/query"
+
+
+class AlphaVantageProvider(MarketDataProvider):
+    rate_limited = True
+
+    # record_dir: when set, every payload is also saved there for ReplayProvider
+    def __init__(self, api_key=API_KEY, timeout=FETCH_TIMEOUT, max_connections=MAX_CONNECTIONS,
+                 record_dir=RECORD_DIR):
+        super().__init__()
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.record_dir = record_dir
+        self._client = None
+
+    # The client is created lazily so it binds to the running event loop, and httpx (with its SSL setup)
+    # is only imported once the first request goes out rather than while the window opens
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx
+            # One pooled, keep-alive client shared by the main view and the watchlist
+            self._client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._client
+
+    async def _request(self, params):
+        # Checked here rather than at import so the app can start (and replay) without a key
+        if not self.api_key:
+            raise ValueError("API_KEY not found in .env file")
+        with metrics.span("http"):
+            response = await self.client.get("", params={**params, "apikey": self.api_key})
+            response.raise_for_status()
+        with metrics.span("decode"):
+            data = response.json()
+        if self.record_dir and payload_error(data) is None:
+            self._record(params, data)
+        return data
+
+    def is_transient(self, error):
+        import httpx
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return isinstance(error, httpx.TransportError) or super().is_transient(error)
+
+    def is_timeout(self, error):
+        import httpx
+        return isinstance(error, httpx.TimeoutException) or super().is_timeout(error)
+
+    # LISTING_STATUS is only served as CSV, so it skips the JSON decoding (and the in-flight sharing)
+    async def listing(self):
+        if not self.api_key:
+            raise ValueError("API_KEY not found in .env file")
+        with metrics.span("http"):
+            response = await self.client.get("", params={"function": "LISTING_STATUS", "apikey": self.api_key})
+            response.raise_for_status()
+        # Errors and throttling still come back as JSON
+        if response.text.lstrip().startswith("{"):
+            raise payload_error(response.json()) or ProviderError("LISTING_STATUS did not return a CSV listing")
+        if self.record_dir:
+            self._record({"function": "LISTING_STATUS"}, response.text, ".csv")
+        return response.text
+
+    def _record(self, params, data, extension=".json"):
+        os.makedirs(self.record_dir, exist_ok=True)
+        path = os.path.join(self.record_dir, fixture_name(params) + extension)
+        if extension == ".json" and "Time Series (Daily)" in data and os.path.exists(path):
+            data = self._merge_recording(path, data)
+        with open(path, "w", encoding="utf-8") as f:
+            if extension == ".json":
+                json.dump(data, f)
+            else:
+                f.write(data)
+
+    # Recordings are named without the outputsize, so a compact delta would replace a recorded full
+    # history with its last 100 bars and replay couldn't serve the long ranges any more. New bars are
+    # merged into the recording instead, or dropped if they don't reach back to it and it is longer.
+    @staticmethod
+    def _merge_recording(path, data):
+        try:
+            with open(path, encoding="utf-8") as f:
+                recorded = json.load(f)
+        except (OSError, ValueError):
+            return data
+        series, new = recorded.get("Time Series (Daily)"), data["Time Series (Daily)"]
+        if not series:
+            return data
+        if new and min(new) <= max(series):
+            return {**data, "Time Series (Daily)": {**series, **new}}
+        return recorded if len(series) > len(new) else data
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
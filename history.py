@@ -0,0 +1,89 @@
+# Decides how much daily history to download: the full history once, then compact deltas
+import asyncio
+import datetime
+
+from config import COMPACT_BARS, RETRY_ATTEMPTS
+from metrics import metrics
+from scheduler import backoff_delay
+
+
+# Calendar days a compact payload safely reaches back (100 trading days is about 140 calendar days)
+COMPACT_SPAN_DAYS = COMPACT_BARS * 7 // 5 - 10
+
+
+# on_update(symbol) is called after new bars for a symbol are stored
+class HistoryLoader:
+    def __init__(self, provider, cache, limiter=None, on_update=None, retries=RETRY_ATTEMPTS):
+        self.provider = provider
+        self.cache = cache
+        self.limiter = limiter
+        self.on_update = on_update
+        self.retries = retries
+        # Download in progress per symbol
+        self._inflight = {}
+
+    # "compact", "full", or None when the cache already covers `bars` bars
+    def plan(self, symbol, bars):
+        has_full = self.cache.has_full(symbol)
+        needs_full = bars > COMPACT_BARS and not has_full
+        if self.cache.is_fresh(symbol) and not needs_full:
+            return None
+        if needs_full:
+            return "full"
+
+        last = self.cache.last_date(symbol)
+        if last is None:
+            return "compact"
+        gap = (datetime.date.today() - datetime.date.fromisoformat(last)).days
+        # A compact payload can't bridge a long gap; refetch everything rather than lose the history
+        if gap > COMPACT_SPAN_DAYS and has_full:
+            return "full"
+        return "compact"
+
+    # Bring the cache up to date for the last `bars` bars; returns True if new bars were stored.
+    # Only one download per symbol runs at a time: other callers wait for it (sharing its result or
+    # error), then plan again against the updated cache, which usually needs nothing more.
+    async def load(self, symbol, bars):
+        updated = False
+        while (task := self._inflight.get(symbol)) is not None:
+            updated = await asyncio.shield(task) or updated
+        outputsize = self.plan(symbol, bars)
+        if outputsize is None:
+            return updated
+        task = asyncio.ensure_future(self._download(symbol, outputsize))
+        self._inflight[symbol] = task
+        task.add_done_callback(self._done)
+        # Shield so a cancelled caller doesn't abort the download for everyone waiting on it
+        return await asyncio.shield(task)
+
+    async def _download(self, symbol, outputsize):
+        try:
+            data = await self._fetch(symbol, outputsize)
+            with metrics.span("cache_merge"):
+                self.cache.merge(symbol, data["Time Series (Daily)"], full=outputsize == "full")
+        finally:
+            # Removed before the task completes, so woken waiters never see a finished download
+            self._inflight.pop(symbol, None)
+        if self.on_update is not None:
+            self.on_update(symbol)
+        return True
+
+    # Throttling and dropped connections are retried with backoff; anything else is reported right away
+    async def _fetch(self, symbol, outputsize):
+        attempt = 0
+        while True:
+            try:
+                if self.limiter is not None:
+                    await self.limiter.acquire()
+                return await self.provider.daily(symbol, outputsize)
+            except Exception as e:
+                attempt += 1
+                if attempt >= self.retries or not self.provider.is_transient(e):
+                    raise
+            await asyncio.sleep(backoff_delay(attempt - 1))
+
+    @staticmethod
+    def _done(task):
+        # Mark the error as retrieved in case every caller was cancelled before it arrived
+        if not task.cancelled():
+            task.exception()
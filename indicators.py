@@ -0,0 +1,292 @@
+# Technical indicators: vectorized over the full history, then updated one bar at a time
+import math
+
+import numpy as np
+
+
+# Exponential moving average seeded with the first value (y[0] = x[0]).
+# Solved block by block in closed form so the growing (1 - alpha) ** -t factor can't overflow.
+def ema(x, alpha):
+    x = np.asarray(x, dtype=np.float64)
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    decay = 1 - alpha
+    block = max(1, int(500 / -math.log(decay))) if decay > 0 else 1
+    prev = x[0]
+    for start in range(0, len(x), block):
+        chunk = x[start:start + block]
+        t = np.arange(len(chunk))
+        # y[t] = decay ** (t + 1) * prev + alpha * sum(decay ** (t - j) * chunk[j] for j <= t)
+        weights = decay ** -t
+        out[start:start + len(chunk)] = decay ** t * (decay * prev + alpha * np.cumsum(chunk * weights))
+        prev = out[start + len(chunk) - 1]
+    return out
+
+
+# Each indicator computes its outputs over a whole array (compute) and can extend them by one bar
+# in O(1) from the state left by the previous bar (step). Both agree up to rounding.
+class Indicator:
+    name = ""
+    outputs = ()
+
+    def key(self):
+        return (self.name,) + tuple(vars(self).values())
+
+    # Output arrays for every bar of `close`, plus the state after the last bar
+    def compute(self, close):
+        raise NotImplementedError
+
+    # Output values for bar `i` given the state after bar i - 1, plus the new state
+    def step(self, state, close, i):
+        raise NotImplementedError
+
+
+class SMA(Indicator):
+    name = "SMA"
+    outputs = ("sma",)
+
+    def __init__(self, period=20):
+        self.period = period
+
+    def compute(self, close):
+        n = self.period
+        sums = np.cumsum(np.concatenate(([0.0], close)))
+        sma = np.full(len(close), np.nan)
+        if len(close) >= n:
+            sma[n - 1:] = (sums[n:] - sums[:-n]) / n
+        # Running sum of the (possibly still partial) window ending at the last bar
+        state = sums[-1] - sums[max(0, len(close) - n)]
+        return {"sma": sma}, state
+
+    def step(self, state, close, i):
+        n = self.period
+        state = (state or 0.0) + close[i] - (close[i - n] if i >= n else 0.0)
+        return (state / n if i >= n - 1 else np.nan,), state
+
+
+class EMA(Indicator):
+    name = "EMA"
+    outputs = ("ema",)
+
+    def __init__(self, period=50):
+        self.period = period
+
+    def compute(self, close):
+        values = ema(close, 2 / (self.period + 1))
+        state = values[-1] if len(values) else None
+        values[:self.period - 1] = np.nan
+        return {"ema": values}, state
+
+    def step(self, state, close, i):
+        state = close[i] if state is None else state + 2 / (self.period + 1) * (close[i] - state)
+        return (state if i >= self.period - 1 else np.nan,), state
+
+
+# Relative Strength Index with Wilder's smoothing (alpha = 1 / period)
+class RSI(Indicator):
+    name = "RSI"
+    outputs = ("rsi",)
+
+    def __init__(self, period=14):
+        self.period = period
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+    def compute(self, close):
+        rsi = np.full(len(close), np.nan)
+        if len(close) < 2:
+            return {"rsi": rsi}, None
+        delta = np.diff(close)
+        avg_gain = ema(np.maximum(delta, 0), 1 / self.period)
+        avg_loss = ema(np.maximum(-delta, 0), 1 / self.period)
+        rsi[1:] = self._rsi(avg_gain, avg_loss)
+        rsi[:self.period] = np.nan
+        return {"rsi": rsi}, (avg_gain[-1], avg_loss[-1])
+
+    def step(self, state, close, i):
+        if i == 0:
+            return (np.nan,), None
+        delta = close[i] - close[i - 1]
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if state is None:
+            state = (gain, loss)
+        else:
+            alpha = 1 / self.period
+            state = (state[0] + alpha * (gain - state[0]), state[1] + alpha * (loss - state[1]))
+        value = float(self._rsi(np.float64(state[0]), np.float64(state[1])))
+        return (value if i >= self.period else np.nan,), state
+
+
+class MACD(Indicator):
+    name = "MACD"
+    outputs = ("macd", "signal", "histogram")
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+
+    def compute(self, close):
+        fast = ema(close, 2 / (self.fast + 1))
+        slow = ema(close, 2 / (self.slow + 1))
+        macd = fast - slow
+        signal = ema(macd, 2 / (self.signal + 1))
+        state = (fast[-1], slow[-1], signal[-1]) if len(close) else None
+        histogram = macd - signal
+        macd[:self.slow - 1] = np.nan
+        signal[:self.slow + self.signal - 2] = np.nan
+        histogram[:self.slow + self.signal - 2] = np.nan
+        return {"macd": macd, "signal": signal, "histogram": histogram}, state
+
+    def step(self, state, close, i):
+        x = close[i]
+        if state is None:
+            state = (x, x, 0.0)
+        else:
+            fast, slow, signal = state
+            fast += 2 / (self.fast + 1) * (x - fast)
+            slow += 2 / (self.slow + 1) * (x - slow)
+            signal += 2 / (self.signal + 1) * ((fast - slow) - signal)
+            state = (fast, slow, signal)
+        macd = state[0] - state[1]
+        if i < self.slow - 1:
+            return (np.nan, np.nan, np.nan), state
+        if i < self.slow + self.signal - 2:
+            return (macd, np.nan, np.nan), state
+        return (macd, state[2], macd - state[2]), state
+
+
+class Bollinger(Indicator):
+    name = "BB"
+    outputs = ("middle", "upper", "lower")
+
+    def __init__(self, period=20, width=2.0):
+        self.period = period
+        self.width = width
+
+    def _bands(self, mean, mean_sq):
+        std = np.sqrt(np.maximum(mean_sq - mean * mean, 0))
+        return mean, mean + self.width * std, mean - self.width * std
+
+    def compute(self, close):
+        n = self.period
+        sums = np.cumsum(np.concatenate(([0.0], close)))
+        sums_sq = np.cumsum(np.concatenate(([0.0], close * close)))
+        middle, upper, lower = (np.full(len(close), np.nan) for _ in range(3))
+        if len(close) >= n:
+            bands = self._bands((sums[n:] - sums[:-n]) / n, (sums_sq[n:] - sums_sq[:-n]) / n)
+            for out, band in zip((middle, upper, lower), bands):
+                out[n - 1:] = band
+        start = max(0, len(close) - n)
+        state = (sums[-1] - sums[start], sums_sq[-1] - sums_sq[start])
+        return {"middle": middle, "upper": upper, "lower": lower}, state
+
+    def step(self, state, close, i):
+        n = self.period
+        total, total_sq = state or (0.0, 0.0)
+        dropped = close[i - n] if i >= n else 0.0
+        total += close[i] - dropped
+        total_sq += close[i] * close[i] - dropped * dropped
+        if i < n - 1:
+            return (np.nan, np.nan, np.nan), (total, total_sq)
+        return tuple(float(v) for v in self._bands(total / n, total_sq / n)), (total, total_sq)
+
+
+class _Entry:
+    __slots__ = ("buffers", "length", "state", "prev_state", "prev_date", "prev_close", "last_date", "last_close")
+
+
+# Indicator results per (symbol, indicator, params). When a series comes back with new bars appended
+# (or its last bar revised), only those bars are stepped through instead of recomputing everything.
+class IndicatorCache:
+    def __init__(self):
+        self._entries = {}
+
+    # Output arrays (views, aligned with `series`) for the indicator
+    def get(self, symbol, indicator, series):
+        key = (symbol,) + indicator.key()
+        entry = self._entries.get(key)
+        close = series.close
+        n = len(close)
+
+        if entry is not None and self._extends(entry, series):
+            if n > entry.length or close[-1] != entry.last_close:
+                self._extend(entry, indicator, series)
+        else:
+            entry = self._compute(indicator, series)
+            self._entries[key] = entry
+        return {name: buffer[:entry.length] for name, buffer in entry.buffers.items()}
+
+    # True when `series` is the cached one with bars appended, or its last bar updated in place
+    @staticmethod
+    def _extends(entry, series):
+        n, m = len(series), entry.length
+        if m == 0 or n < m or series.dates[m - 1] != entry.last_date:
+            return False
+        return m == 1 or (series.dates[m - 2] == entry.prev_date and series.close[m - 2] == entry.prev_close)
+
+    def _compute(self, indicator, series):
+        close = series.close
+        n = len(close)
+        entry = _Entry()
+        # Compute everything but the last bar, then step it, so we hold the state needed to revise it
+        outputs, state = indicator.compute(close[:-1]) if n else indicator.compute(close)
+        entry.buffers = {}
+        for name in indicator.outputs:
+            buffer = np.empty(max(16, n * 2))
+            buffer[:len(outputs[name])] = outputs[name]
+            entry.buffers[name] = buffer
+        entry.length = max(0, n - 1)
+        entry.state = state
+        if n:
+            self._append(entry, indicator, series, n - 1)
+        return entry
+
+    def _extend(self, entry, indicator, series):
+        # Re-apply the last cached bar (it may have changed), then every new one
+        entry.length -= 1
+        entry.state = entry.prev_state
+        for i in range(entry.length, len(series)):
+            self._append(entry, indicator, series, i)
+
+    def _append(self, entry, indicator, series, i):
+        close = series.close
+        values, state = indicator.step(entry.state, close, i)
+        for name, value in zip(indicator.outputs, values):
+            buffer = entry.buffers[name]
+            # Grow by doubling so appends stay O(1) amortized
+            if i >= len(buffer):
+                grown = np.empty(len(buffer) * 2)
+                grown[:len(buffer)] = buffer
+                entry.buffers[name] = buffer = grown
+            buffer[i] = value
+        entry.prev_state, entry.state = entry.state, state
+        entry.length = i + 1
+        entry.prev_date = series.dates[i - 1] if i else None
+        entry.prev_close = close[i - 1] if i else None
+        entry.last_date = series.dates[i]
+        entry.last_close = close[i]
+
+    def clear(self, symbol=None):
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries = {key: entry for key, entry in self._entries.items() if key[0] != symbol}
+
+
+# Indicators available as chart overlays, by label
+OVERLAYS = {
+    "SMA 20": SMA(20),
+    "EMA 50": EMA(50),
+    "Bollinger 20": Bollinger(20, 2.0),
+}
+
+# Oscillators live on their own scale, drawn under the price chart
+OSCILLATORS = {
+    "RSI 14": RSI(14),
+    "MACD 12/26/9": MACD(12, 26, 9),
+}
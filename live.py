@@ -0,0 +1,77 @@
+# Live mode: polls the latest quote for a symbol in the background into a ring buffer
+import asyncio
+
+import numpy as np
+
+from config import LIVE_CAPACITY, LIVE_INTERVAL
+from ringbuffer import RingBuffer
+
+
+# Intraday bars to seed the buffer with: (times, closes, volumes) oldest first
+def parse_intraday(data, interval):
+    bars = data[f"Time Series ({interval})"]
+    stamps = sorted(bars)
+    return (
+        np.array(stamps, dtype="datetime64[s]"),
+        np.array([float(bars[t]["4. close"]) for t in stamps]),
+        np.array([int(float(bars[t]["5. volume"])) for t in stamps], dtype=np.int64),
+    )
+
+
+# on_ticks(symbol, buffer, first_seq) is called after new ticks land; first_seq is the first new one.
+# on_error(symbol, error) is called when a poll fails; polling carries on regardless.
+class LiveFeed:
+    def __init__(self, provider, on_ticks, on_error=None, limiter=None,
+                 interval=LIVE_INTERVAL, capacity=LIVE_CAPACITY, intraday_interval="1min"):
+        self.provider = provider
+        self.on_ticks = on_ticks
+        self.on_error = on_error
+        self.limiter = limiter
+        self.interval = interval
+        self.capacity = capacity
+        self.intraday_interval = intraday_interval
+        self.buffers = {}
+        self._tasks = {}
+
+    def start(self, symbol):
+        if symbol in self._tasks:
+            return
+        self.buffers[symbol] = RingBuffer(self.capacity)
+        self._tasks[symbol] = asyncio.ensure_future(self._poll(symbol))
+
+    def stop(self, symbol=None):
+        for key in [symbol] if symbol is not None else list(self._tasks):
+            task = self._tasks.pop(key, None)
+            if task is not None:
+                task.cancel()
+            self.buffers.pop(key, None)
+
+    async def _call(self, request, *args):
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        return await request(*args)
+
+    async def _poll(self, symbol):
+        buffer = self.buffers[symbol]
+        try:
+            data = await self._call(self.provider.intraday, symbol, self.intraday_interval)
+            buffer.extend(*parse_intraday(data, self.intraday_interval))
+            self.on_ticks(symbol, buffer, 0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(symbol, e)
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                quote = (await self._call(self.provider.quote, symbol))["Global Quote"]
+                first = buffer.count
+                buffer.append(np.datetime64("now", "s"), float(quote["05. price"]), int(quote["06. volume"]))
+                self.on_ticks(symbol, buffer, first)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(symbol, e)
@@ -0,0 +1,76 @@
+# Timing spans for the fetch -> parse -> render path, with percentile summaries
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from config import METRICS_WINDOW
+
+
+logger = logging.getLogger("stocks.metrics")
+
+
+class Metrics:
+    # Keeps the last `window` samples per stage
+    def __init__(self, window=METRICS_WINDOW):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._samples[name].append(seconds)
+        logger.debug(json.dumps({"span": name, "ms": round(seconds * 1000, 3)}))
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    # {stage: {"count", "p50", "p95", "p99", "max"}} in milliseconds
+    def summary(self):
+        with self._lock:
+            samples = {name: np.array(values) * 1000 for name, values in self._samples.items() if values}
+        result = {}
+        for name, values in samples.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            result[name] = {
+                "count": len(values),
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(values.max()), 3),
+            }
+        return result
+
+    # Fixed-width table, one stage per line
+    def format(self, stages=None):
+        summary = self.summary()
+        lines = [f"{'stage':<14}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for name in stages or sorted(summary):
+            if name in summary:
+                s = summary[name]
+                lines.append(f"{name:<14}{s['count']:>6}{s['p50']:>9.2f}{s['p95']:>9.2f}{s['p99']:>9.2f}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"generated_at": time.time(), "stages_ms": self.summary()}, f, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+# Process-wide instance used by the app, providers and benchmarks
+metrics = Metrics()
+
+# Stages of a lookup, in the order they happen
+STAGES = ("http", "decode", "cache_merge", "load", "parse", "render", "page_update", "total")
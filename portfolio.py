@@ -0,0 +1,96 @@
+# Holdings (quantity, cost per share) valued all at once: one vectorized pass over every position
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from config import PORTFOLIO_PATH
+
+
+# Arrays aligned with Portfolio.symbols (NaN where a symbol has no price yet), plus totals
+Valuation = namedtuple(
+    "Valuation",
+    "price price_change price_change_percent value cost pnl pnl_percent day_pnl "
+    "total_value total_cost total_pnl total_pnl_percent total_day_pnl",
+)
+
+
+class Portfolio:
+    def __init__(self, holdings=()):
+        self.symbols = []
+        self.quantity = np.empty(0)
+        self.cost_basis = np.empty(0)
+        for symbol, quantity, cost_basis in holdings:
+            self.add(symbol, quantity, cost_basis)
+
+    @classmethod
+    def load(cls, path=PORTFOLIO_PATH):
+        if not path or not os.path.exists(path):
+            return cls()
+        # A damaged or hand-edited file must not keep the app from opening
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls((h["symbol"], float(h["quantity"]), float(h["cost_basis"])) for h in json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls()
+
+    def save(self, path=PORTFOLIO_PATH):
+        if not path:
+            return
+        holdings = [
+            {"symbol": symbol, "quantity": float(quantity), "cost_basis": float(cost_basis)}
+            for symbol, quantity, cost_basis in zip(self.symbols, self.quantity, self.cost_basis)
+        ]
+        # Written aside and swapped in, so a crash mid-write leaves the previous file intact
+        partial = path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(holdings, f, indent=2)
+        os.replace(partial, path)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    # Buying more of a symbol already held averages the cost per share
+    def add(self, symbol, quantity, cost_basis):
+        if symbol in self.symbols:
+            i = self.symbols.index(symbol)
+            total = self.quantity[i] + quantity
+            if total:
+                self.cost_basis[i] = (self.quantity[i] * self.cost_basis[i] + quantity * cost_basis) / total
+            self.quantity[i] = total
+            return
+        self.symbols.append(symbol)
+        self.quantity = np.append(self.quantity, float(quantity))
+        self.cost_basis = np.append(self.cost_basis, float(cost_basis))
+
+    def remove(self, symbol):
+        i = self.symbols.index(symbol)
+        del self.symbols[i]
+        self.quantity = np.delete(self.quantity, i)
+        self.cost_basis = np.delete(self.cost_basis, i)
+
+    # `latest` maps symbols to (close, previous close), e.g. from StockCache.latest_closes
+    def value(self, latest):
+        missing = (np.nan, np.nan)
+        prices = np.array([latest.get(symbol, missing) for symbol in self.symbols], dtype=np.float64).reshape(-1, 2)
+        price, previous = prices[:, 0], prices[:, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price_change = price - previous
+            price_change_percent = np.where(previous != 0, price_change / previous * 100, 0.0)
+            value = self.quantity * price
+            cost = self.quantity * self.cost_basis
+            pnl = value - cost
+            pnl_percent = np.where(cost != 0, pnl / cost * 100, 0.0)
+        day_pnl = self.quantity * price_change
+
+        # Totals only cover the positions that have a price
+        priced = ~np.isnan(price)
+        total_value = float(value[priced].sum())
+        total_cost = float(cost[priced].sum())
+        total_pnl = total_value - total_cost
+        return Valuation(
+            price, price_change, price_change_percent, value, cost, pnl, pnl_percent, day_pnl,
+            total_value, total_cost, total_pnl, total_pnl / total_cost * 100 if total_cost else 0.0,
+            float(np.nansum(day_pnl)),
+        )
@@ -0,0 +1,182 @@
+# Market data providers: where Alpha Vantage style payloads come from
+import asyncio
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+
+from config import DATA_PROVIDER, REPLAY_DIR, REPLAY_LATENCY, COMPACT_BARS
+from metrics import metrics
+
+
+class ProviderError(Exception):
+    pass
+
+
+# Too many calls (a rate limit "Note" / "Information" payload); worth retrying after a pause
+class Throttled(ProviderError):
+    pass
+
+
+# How Alpha Vantage's per-minute and per-day limit messages read
+RATE_LIMIT_WORDING = ("rate limit", "call frequency", "requests per")
+
+
+# Alpha Vantage answers errors with HTTP 200 and one of these keys instead of data. "Note" and
+# "Information" also carry permanent answers (a premium-only parameter, an invalid key), which
+# retrying would only spend more of the daily quota on, so only rate limit messages are Throttled.
+def payload_error(data):
+    if "Error Message" in data:
+        return ProviderError(data["Error Message"])
+    for key in ("Note", "Information"):
+        if key in data:
+            message = str(data[key])
+            if any(wording in message.lower() for wording in RATE_LIMIT_WORDING):
+                return Throttled(message)
+            return ProviderError(message)
+    return None
+
+
+# Every provider returns payloads shaped like Alpha Vantage's JSON, so the rest of the app
+# doesn't care where they came from. Identical queries made while one is pending share one request.
+class MarketDataProvider(ABC):
+    # Whether calls count against an upstream quota and should go through the rate limiter
+    rate_limited = False
+
+    def __init__(self):
+        # Requests currently in progress, keyed by their query parameters
+        self._inflight = {}
+
+    @abstractmethod
+    async def _request(self, params):
+        ...
+
+    async def query(self, **params):
+        key = tuple(sorted(params.items()))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # Shield so a cancelled caller doesn't cancel the call for everyone else waiting on it
+        data = await asyncio.shield(task)
+        error = payload_error(data)
+        if error is not None:
+            raise error
+        return data
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+        # Mark the error as retrieved in case every caller was cancelled before it arrived
+        if not task.cancelled():
+            task.exception()
+
+    # outputsize "compact" is the latest 100 bars, "full" is the complete history
+    async def daily(self, symbol, outputsize="compact"):
+        return await self.query(function="TIME_SERIES_DAILY", symbol=symbol, outputsize=outputsize)
+
+    async def intraday(self, symbol, interval="1min"):
+        return await self.query(function="TIME_SERIES_INTRADAY", symbol=symbol, interval=interval)
+
+    async def quote(self, symbol):
+        return await self.query(function="GLOBAL_QUOTE", symbol=symbol)
+
+    # CSV text of every active symbol (LISTING_STATUS), or None when the source doesn't have one
+    async def listing(self):
+        return None
+
+    # Errors worth retrying after a pause rather than reporting straight away
+    def is_transient(self, error):
+        return isinstance(error, (Throttled, ConnectionError, TimeoutError))
+
+    # The request took too long, as opposed to being answered with an error
+    def is_timeout(self, error):
+        return isinstance(error, TimeoutError)
+
+    async def close(self):
+        pass
+
+
+# File name a recorded payload is stored under, without the extension
+def fixture_name(params):
+    name = params["function"]
+    if "symbol" in params:
+        name += f"_{params['symbol']}"
+    if "interval" in params:
+        name += f"_{params['interval']}"
+    return name
+
+
+# Alpha Vantage CSV (datatype=csv) time series back into the JSON shape
+def csv_to_payload(text, params):
+    if params["function"] == "TIME_SERIES_DAILY":
+        key = "Time Series (Daily)"
+    else:
+        key = f"Time Series ({params.get('interval', '1min')})"
+    series = {}
+    for row in csv.DictReader(io.StringIO(text)):
+        series[row["timestamp"]] = {
+            "1. open": row["open"],
+            "2. high": row["high"],
+            "3. low": row["low"],
+            "4. close": row["close"],
+            "5. volume": row["volume"],
+        }
+    return {key: series}
+
+
+# Serves recorded payloads from a directory (e.g. TIME_SERIES_DAILY_AAPL.json or .csv) after a fixed
+# latency, for offline runs and deterministic benchmarks. No API key or network needed.
+class ReplayProvider(MarketDataProvider):
+    def __init__(self, directory=REPLAY_DIR, latency=REPLAY_LATENCY):
+        super().__init__()
+        self.directory = directory
+        self.latency = latency
+        # Raw file contents; they are decoded on every request, like a real response would be
+        self._files = {}
+
+    def _read(self, name):
+        if name not in self._files:
+            for extension in (".json", ".csv"):
+                path = os.path.join(self.directory, name + extension)
+                if os.path.exists(path):
+                    with open(path, encoding="utf-8") as f:
+                        self._files[name] = (extension, f.read())
+                    break
+            else:
+                self._files[name] = None
+        return self._files[name]
+
+    async def _request(self, params):
+        with metrics.span("http"):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            recorded = self._read(fixture_name(params))
+        if recorded is None:
+            # What Alpha Vantage answers for an unknown symbol
+            return {"Error Message": f"Invalid API call. No recorded data for {params.get('symbol')}."}
+        extension, text = recorded
+        with metrics.span("decode"):
+            data = json.loads(text) if extension == ".json" else csv_to_payload(text, params)
+
+        # Recordings are usually full histories; trim them like the API does for compact requests
+        if params.get("outputsize", "compact") == "compact" and "Time Series (Daily)" in data:
+            dates = sorted(data["Time Series (Daily)"], reverse=True)[:COMPACT_BARS]
+            data = {**data, "Time Series (Daily)": {d: data["Time Series (Daily)"][d] for d in dates}}
+        return data
+
+
+    async def listing(self):
+        recorded = self._read(fixture_name({"function": "LISTING_STATUS"}))
+        return recorded[1] if recorded is not None and recorded[0] == ".csv" else None
+
+
+def make_provider(name=DATA_PROVIDER):
+    if name == "replay":
+        return ReplayProvider()
+    if name == "alphavantage":
+        # Imported here so offline runs never load httpx
+        from fetcher import AlphaVantageProvider
+        return AlphaVantageProvider()
+    raise ValueError(f"Unknown DATA_PROVIDER: {name}")
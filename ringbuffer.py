@@ -0,0 +1,41 @@
+# Fixed-size, preallocated ring buffer of ticks (time, price, volume)
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.times = np.empty(capacity, dtype="datetime64[s]")
+        self.prices = np.empty(capacity, dtype=np.float64)
+        self.volumes = np.empty(capacity, dtype=np.int64)
+        # Total ticks ever appended; tick n lives in slot n % capacity
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, time, price, volume=0):
+        slot = self.count % self.capacity
+        self.times[slot] = time
+        self.prices[slot] = price
+        self.volumes[slot] = volume
+        self.count += 1
+
+    def extend(self, times, prices, volumes):
+        # Only the newest `capacity` ticks would survive anyway
+        skipped = max(0, len(times) - self.capacity)
+        slots = np.arange(self.count + skipped, self.count + len(times)) % self.capacity
+        self.times[slots] = times[skipped:]
+        self.prices[slots] = prices[skipped:]
+        self.volumes[slots] = volumes[skipped:]
+        self.count += len(times)
+
+    # Ticks numbered `seq` and up that are still held, oldest first: (seqs, times, prices, volumes)
+    def since(self, seq=0):
+        seqs = np.arange(max(seq, self.count - len(self)), self.count)
+        slots = seqs % self.capacity
+        return seqs, self.times[slots], self.prices[slots], self.volumes[slots]
+
+    def latest(self):
+        slot = (self.count - 1) % self.capacity
+        return self.times[slot], self.prices[slot], self.volumes[slot]
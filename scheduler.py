@@ -0,0 +1,129 @@
+# Rate-limit aware scheduler for loading many symbols concurrently
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+from config import CALLS_PER_MINUTE, CALLS_PER_DAY, RETRY_DELAY, RETRY_MAX_DELAY, WATCHLIST_WORKERS
+
+
+class RateLimited(Exception):
+    pass
+
+
+# Classic token bucket: holds up to `capacity` tokens, refilled continuously over `period` seconds
+class TokenBucket:
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Seconds until a token is available (0 when one is available now)
+    def wait_time(self):
+        self._refill()
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+
+# Alpha Vantage enforces both a per-minute and a per-day quota, so a call needs a token from each
+class RateLimiter:
+    def __init__(self, per_minute=CALLS_PER_MINUTE, per_day=CALLS_PER_DAY, max_wait=120):
+        self.buckets = [TokenBucket(per_minute, 60), TokenBucket(per_day, 24 * 60 * 60)]
+        self.max_wait = max_wait
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                wait = max(bucket.wait_time() for bucket in self.buckets)
+                if wait == 0:
+                    for bucket in self.buckets:
+                        bucket.take()
+                    return
+                # Don't park a worker for hours when the daily quota is gone
+                if wait > self.max_wait:
+                    raise RateLimited("API rate limit reached, try again later")
+                await asyncio.sleep(wait)
+
+
+# Exponential backoff with jitter: between half and all of base * 2 ** attempt (capped), so callers
+# throttled together don't all come back at the same moment
+def backoff_delay(attempt, base=RETRY_DELAY, cap=RETRY_MAX_DELAY):
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# Loads symbols through a shared history loader with a few workers, lowest priority value first.
+# on_result(symbol, bars, error) is called as soon as each symbol is done.
+class WatchlistScheduler:
+    def __init__(self, loader, on_result, workers=WATCHLIST_WORKERS):
+        self.loader = loader
+        self.cache = loader.cache
+        self.on_result = on_result
+        self.workers = workers
+        self._heap = []
+        self._priority = {}
+        self._counter = itertools.count()
+        self._ready = asyncio.Event()
+        self._tasks = []
+
+    def submit(self, symbol, priority=1):
+        # Re-submitting only matters when it makes the symbol more urgent
+        if symbol in self._priority and self._priority[symbol] <= priority:
+            return
+        self._priority[symbol] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), symbol))
+        self._ready.set()
+
+    # Bump symbols that just scrolled into view ahead of the rest
+    def prioritize(self, symbols):
+        for symbol in symbols:
+            if symbol in self._priority:
+                self.submit(symbol, priority=0)
+
+    def _pop(self):
+        while self._heap:
+            priority, _, symbol = heapq.heappop(self._heap)
+            # Skip entries superseded by a later, higher priority push
+            if self._priority.get(symbol) == priority:
+                del self._priority[symbol]
+                return symbol
+        return None
+
+    async def _worker(self):
+        while True:
+            symbol = self._pop()
+            if symbol is None:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            try:
+                # Rows only show the latest change, so two bars are enough
+                await self.loader.load(symbol, 2)
+                bars = self.cache.get(symbol, days=2)
+                self.on_result(symbol, bars, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Whatever is cached still beats an empty row
+                self.on_result(symbol, self.cache.get(symbol, days=2), e)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._heap.clear()
+        self._priority.clear()
@@ -0,0 +1,95 @@
+# Columnar OHLCV time series backed by NumPy arrays
+from collections import namedtuple
+
+import numpy as np
+
+
+Bar = namedtuple("Bar", "date open high low close volume")
+
+
+class OHLCVSeries:
+    __slots__ = ("dates", "open", "high", "low", "close", "volume")
+
+    # Columns must be equal length and sorted oldest first
+    def __init__(self, dates, open, high, low, close, volume):
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    # From cache rows: (date, open, high, low, close, volume) oldest first
+    @classmethod
+    def from_rows(cls, rows):
+        if not rows:
+            return cls.empty()
+        dates, opens, highs, lows, closes, volumes = zip(*rows)
+        return cls(
+            np.array(dates, dtype="datetime64[D]"),
+            np.array(opens, dtype=np.float64),
+            np.array(highs, dtype=np.float64),
+            np.array(lows, dtype=np.float64),
+            np.array(closes, dtype=np.float64),
+            np.array(volumes, dtype=np.int64),
+        )
+
+    @classmethod
+    def empty(cls):
+        prices = np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype="datetime64[D]"), prices, prices, prices, prices, np.empty(0, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # Basic slicing returns views, nothing is copied
+            return OHLCVSeries(
+                self.dates[index], self.open[index], self.high[index],
+                self.low[index], self.close[index], self.volume[index],
+            )
+        return Bar(
+            str(self.dates[index]), float(self.open[index]), float(self.high[index]),
+            float(self.low[index]), float(self.close[index]), int(self.volume[index]),
+        )
+
+    # Last `n` bars as a view
+    def tail(self, n):
+        return self[-n:] if n > 0 else self[len(self):]
+
+    # Bars on or after `date` as a view
+    def since(self, date):
+        start = np.searchsorted(self.dates, np.datetime64(date, "D"), side="left")
+        return self[start:]
+
+    @property
+    def latest(self):
+        return self[-1]
+
+
+# Closes of several series on their combined trading days from `start` on, as a (len(series), days)
+# array. A day one series didn't trade (holiday, missing bar) repeats its previous close; days before
+# its first bar are NaN. One searchsorted per series, no per-date lookups.
+def align_closes(series_list, start=None):
+    if start is not None:
+        start = np.datetime64(start, "D")
+        windows = [series.since(start).dates for series in series_list]
+    else:
+        windows = [series.dates for series in series_list]
+    dates = np.unique(np.concatenate(windows)) if windows else np.empty(0, dtype="datetime64[D]")
+    closes = np.full((len(series_list), len(dates)), np.nan)
+    for row, series in zip(closes, series_list):
+        # Latest bar on or before each date, looked up in the whole series so the first day can fill too
+        index = np.searchsorted(series.dates, dates, side="right") - 1
+        traded = index >= 0
+        row[traded] = series.close[index[traded]]
+    return dates, closes
+
+
+# Percent change of each row from its first known value
+def percent_returns(closes):
+    known = ~np.isnan(closes)
+    first = closes[np.arange(len(closes)), known.argmax(axis=1)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (closes / first[:, None] - 1) * 100
@@ -0,0 +1,32 @@
+# What the last session was looking at (symbol, range, compared symbols, watchlist), saved as JSON so
+# the next start can draw it from the cache straight away while fresh data loads in the background
+import json
+import os
+
+from config import SNAPSHOT_PATH
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    if not path or not os.path.exists(path):
+        return {}
+    # A damaged snapshot only costs the warm start, never the app itself
+    try:
+        with open(path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return snapshot if isinstance(snapshot, dict) else {}
+
+
+def save_snapshot(snapshot, path=SNAPSHOT_PATH):
+    if not path:
+        return
+    # Written aside and swapped in, so quitting mid-write leaves the previous snapshot intact.
+    # Failing to save (e.g. a read-only folder) only costs the next warm start.
+    partial = path + ".tmp"
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(partial, path)
+    except OSError:
+        pass
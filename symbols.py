@@ -0,0 +1,81 @@
+# Symbol index for autocomplete and validation: sorted arrays searched with bisect, so a keystroke
+# costs O(log n + k) for k suggestions instead of a scan over every listed symbol
+import bisect
+import csv
+import io
+import json
+
+
+# (symbol, name, exchange) rows from an Alpha Vantage LISTING_STATUS CSV, skipping delisted ones
+def listing_rows(text):
+    for row in csv.DictReader(io.StringIO(text)):
+        if row.get("status", "Active") == "Active" and row.get("symbol"):
+            yield row["symbol"], row.get("name", ""), row.get("exchange", "")
+
+
+# (symbol, name, region) rows from a SYMBOL_SEARCH payload
+def search_rows(data):
+    for match in data.get("bestMatches", []):
+        yield match["1. symbol"], match.get("2. name", ""), match.get("4. region", "")
+
+
+# `complete`: the rows are a full listing (LISTING_STATUS) rather than a few search results
+class SymbolIndex:
+    def __init__(self, rows=(), complete=False):
+        self.complete = complete
+        listed = {}
+        for symbol, name, exchange in rows:
+            listed[symbol.upper()] = (name, exchange)
+        self.symbols = sorted(listed)
+        self.names = [listed[symbol][0] for symbol in self.symbols]
+        self.exchanges = [listed[symbol][1] for symbol in self.symbols]
+        # Lower-cased company names with the position of their symbol, to search by name too
+        self._by_name = sorted((name.lower(), i) for i, name in enumerate(self.names) if name)
+
+    # Index from a LISTING_STATUS .csv or a saved SYMBOL_SEARCH .json file
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            if path.endswith(".json"):
+                return cls(search_rows(json.load(f)))
+            return cls(listing_rows(f.read()), complete=True)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _find(self, symbol):
+        i = bisect.bisect_left(self.symbols, symbol)
+        return i if i < len(self.symbols) and self.symbols[i] == symbol else None
+
+    def __contains__(self, symbol):
+        return self._find(symbol.upper()) is not None
+
+    # True only for symbols that can't exist: LISTING_STATUS covers every US stock and ETF but no other
+    # market (tickers with an exchange suffix such as TSCO.LON or SHOP.TRT), and search results cover nothing
+    def is_unknown(self, symbol):
+        return self.complete and "." not in symbol and symbol not in self
+
+    def name(self, symbol):
+        i = self._find(symbol.upper())
+        return self.names[i] if i is not None else None
+
+    # Up to `limit` (symbol, name, exchange) matches: symbols starting with `text` (an exact match
+    # sorts first), then companies whose name starts with it
+    def suggest(self, text, limit=8):
+        text = text.strip()
+        if not text:
+            return []
+        found = []
+        prefix = text.upper()
+        i = bisect.bisect_left(self.symbols, prefix)
+        while i < len(self.symbols) and len(found) < limit and self.symbols[i].startswith(prefix):
+            found.append(i)
+            i += 1
+
+        prefix = text.lower()
+        j = bisect.bisect_left(self._by_name, (prefix,))
+        while j < len(self._by_name) and len(found) < limit and self._by_name[j][0].startswith(prefix):
+            if self._by_name[j][1] not in found:
+                found.append(self._by_name[j][1])
+            j += 1
+        return [(self.symbols[i], self.names[i], self.exchanges[i]) for i in found]